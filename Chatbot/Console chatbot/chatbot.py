@@ -1,8 +1,32 @@
-from probability import get_response
+import sys
+
+import probability
+from probability import RULE_BASE, get_response
+
+# reincarca regulile cand rules.json se schimba
+RULE_BASE.watch()
+
+# python chatbot.py --ollama [model]: mesajele fara regula ajung la un model local
+if sys.argv[1:2] == ['--ollama']:
+    from fallback import OllamaFallback
+    probability.FALLBACK = OllamaFallback(*sys.argv[2:3])
 
 while True:
     user_input = input('You: ').strip()
     if user_input == 'exit':
         break
     else: 
-        print('Bot: ' + get_response(user_input))
\ No newline at end of file
+        # raspunsul modelului (--ollama) e afisat pe masura ce sosesc bucatile
+        streamed = []
+
+        def show(piece):
+            if not streamed:
+                print('Bot: ', end='')
+            streamed.append(piece)
+            print(piece, end='', flush=True)
+
+        response = get_response(user_input, on_token=show)
+        if streamed:
+            print()
+        if response != ''.join(streamed).strip():
+            print('Bot: ' + response)
\ No newline at end of file
@@ -0,0 +1,153 @@
+import sys
+import json
+import time
+import random
+from collections import Counter
+
+from normalize import tokenize
+from probability import RULE_BASE, check_all_messages
+from rule_index import RuleIndex
+from server import percentile
+
+
+def load_corpus(path):
+    """Reads labelled messages, one {"message", "intent"} object per line.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def intent_of(index, rule_id):
+    if rule_id is None or rule_id < 0:
+        return "unknown"
+    return index.rules[rule_id].get("intent", f"rule {rule_id}")
+
+
+def predict(index, message):
+    """Answers `message` with `index` through get_response's own path
+    (check_all_messages), returning the predicted intent.
+    """
+    words = index.normalizer.normalize(tokenize(message))
+    check_all_messages(words, message, index)
+    # the rule lookup check_all_messages just made, from the same cache
+    return intent_of(index, index.cached_best_rule(tuple(sorted(words))))
+
+
+def latency_summary(latencies):
+    return {
+        name: round(percentile(latencies, fraction) * 1e6, 1)
+        for name, fraction in (("p50_us", 0.50), ("p90_us", 0.90),
+                               ("p99_us", 0.99), ("max_us", 1.0))
+    }
+
+
+def evaluate(corpus, index=None):
+    """Replays `corpus` through the rules of `index` (by default the live
+    rule base): intent accuracy, the confused (expected, predicted) pairs
+    and the latency of answering each message.
+    """
+    index = index or RULE_BASE.index
+    confusion = Counter()
+    latencies = []
+    for item in corpus:
+        # the timed call is the one making the prediction, on `index`
+        start = time.perf_counter()
+        predicted = predict(index, item["message"])
+        latencies.append(time.perf_counter() - start)
+        confusion[item["intent"], predicted] += 1
+    correct = sum(n for (expected, got), n in confusion.items() if expected == got)
+
+    return {
+        "messages": len(corpus),
+        "accuracy": round(correct / len(corpus), 4) if corpus else 0.0,
+        "confusion": {
+            f"{expected} -> {got}": n
+            for (expected, got), n in sorted(confusion.items()) if expected != got
+        },
+        "latency": latency_summary(latencies),
+    }
+
+
+# ========= synthetic rule bases for scaling ========
+def synthetic_rules(count, vocabulary_size=None, seed=0):
+    """`count` rules over a vocabulary that grows with them, like a real
+    rule base: 2-6 keywords each, some with a required word or a single
+    response.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(vocabulary_size or max(50, count // 2))]
+    rules = []
+    for i in range(count):
+        keywords = rng.sample(vocabulary, rng.randint(2, 6))
+        rule = {"intent": f"intent{i}", "keywords": keywords, "response": f"response {i}"}
+        if rng.random() < 0.3:
+            rule["required"] = [keywords[0]]
+        if rng.random() < 0.2:
+            rule["single_response"] = True
+        rules.append(rule)
+    return rules
+
+
+def synthetic_corpus(rules, count, seed=0):
+    """Messages made of most of a rule's keywords plus a few other words,
+    labelled with that rule's intent.
+    """
+    rng = random.Random(seed)
+    filler = ["please", "the", "a", "now", "thanks", "today"]
+    corpus = []
+    for _ in range(count):
+        rule = rng.choice(rules)
+        words = list(rule["keywords"])
+        rng.shuffle(words)
+        words = words[:max(len(words) - 1, 1)] + list(rule.get("required", ()))
+        words += rng.sample(filler, rng.randint(0, 2))
+        rng.shuffle(words)
+        corpus.append({"message": " ".join(words), "intent": rule["intent"]})
+    return corpus
+
+
+def scaling(sizes=(10, 100, 1000, 10000), messages=2000):
+    """Scoring latency (uncached) as the rule base grows: with the index it
+    should grow much slower than the number of rules.
+    """
+    results = []
+    for size in sizes:
+        rules = synthetic_rules(size)
+        index = RuleIndex(rules)
+        corpus = synthetic_corpus(rules, messages)
+        tokenized = [index.normalizer.normalize(tokenize(item["message"])) for item in corpus]
+        latencies = []
+        for words in tokenized:
+            start = time.perf_counter()
+            index.best_rule(words)
+            latencies.append(time.perf_counter() - start)
+        hits = sum(
+            intent_of(index, index.best_rule(words)) == item["intent"]
+            for words, item in zip(tokenized, corpus))
+        results.append({
+            "rules": size,
+            "accuracy": round(hits / len(corpus), 4),
+            "latency": latency_summary(latencies),
+        })
+    return results
+
+
+def sublinear(results, fraction=0.1):
+    """True if the median latency of `scaling` results grew by less than
+    `fraction` of the growth in the number of rules, smallest to largest.
+    """
+    first, last = results[0], results[-1]
+    latency_growth = last["latency"]["p50_us"] / first["latency"]["p50_us"]
+    return latency_growth < fraction * last["rules"] / first["rules"]
+
+
+if __name__ == "__main__":
+    # python evaluate.py [corpus.jsonl] | python evaluate.py --scale
+    if sys.argv[1:] == ["--scale"]:
+        result = scaling()
+    else:
+        path = sys.argv[1] if len(sys.argv) > 1 else "corpus.jsonl"
+        result = evaluate(load_corpus(path))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if sys.argv[1:] == ["--scale"] and not sublinear(result):
+        sys.exit("latency grew about as fast as the number of rules")
@@ -0,0 +1,165 @@
+import json
+import time
+import queue
+import threading
+from collections import OrderedDict
+
+import requests
+
+from normalize import tokenize
+
+
+# end markers of a stream read by `OllamaFallback.read`
+DONE = object()
+END = object()
+
+
+class CircuitBreaker:
+    """Stops calling a failing model: after `failure_threshold` failures in
+    a row the circuit opens and calls are skipped for `reset_timeout`
+    seconds, then a single trial call decides whether it closes again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.trial = True
+            return True
+
+    def record(self, success):
+        with self.lock:
+            self.trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+
+
+class OllamaFallback:
+    """Answers the messages no rule matched with a local Ollama model.
+
+    The answer is streamed from /api/generate; `on_token` gets every piece
+    as it arrives. Each call has a total `budget` in seconds: when it runs
+    out the text received so far is returned, or None if there is none,
+    so the bot can fall back to `unknown()`. Complete answers are cached
+    by the message's tokenised words (so "Hello!!" and "hello" share an
+    entry), and a `CircuitBreaker` skips the model while it keeps failing.
+    """
+
+    def __init__(self, model="gemma3:1b", url="http://localhost:11434",
+                 budget=2.0, cache_size=1024, breaker=None, session=None):
+        self.model = model
+        self.url = url.rstrip("/") + "/api/generate"
+        self.budget = budget
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.breaker = breaker or CircuitBreaker()
+        self.session = session or requests.Session()
+        self.lock = threading.Lock()
+
+    def cache_key(self, message):
+        return " ".join(tokenize(message))
+
+    def cached(self, key):
+        with self.lock:
+            answer = self.cache.get(key)
+            if answer is not None:
+                self.cache.move_to_end(key)
+            return answer
+
+    def store(self, key, answer):
+        with self.lock:
+            self.cache[key] = answer
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def read(self, message, pieces, stop):
+        """Puts the pieces of the model's answer on `pieces`, then DONE
+        (or END if the stream stopped early, or the exception raised).
+        """
+        try:
+            with self.session.post(
+                    self.url, json={"model": self.model, "prompt": message, "stream": True},
+                    stream=True, timeout=self.budget) as response:
+                response.raise_for_status()
+                # chunk_size=None: hand over each piece as soon as it arrives
+                for line in response.iter_lines(chunk_size=None):
+                    if stop.is_set():
+                        return
+                    if line:
+                        chunk = json.loads(line)
+                        pieces.put(chunk.get("response", ""))
+                        if chunk.get("done"):
+                            pieces.put(DONE)
+                            return
+            pieces.put(END)
+        except (requests.RequestException, ValueError) as error:
+            pieces.put(error)
+
+    def stream(self, message, deadline, on_token=None):
+        """Returns (text, complete) read from the model before `deadline`.
+
+        The stream is read by a daemon thread, so a model that stalls
+        mid-answer can't hold the caller past the deadline.
+        """
+        pieces = queue.Queue()
+        stop = threading.Event()
+        threading.Thread(
+            target=self.read, args=(message, pieces, stop), daemon=True).start()
+        text = []
+        while True:
+            try:
+                piece = pieces.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                stop.set()
+                return "".join(text), False
+            if piece is DONE or piece is END:
+                return "".join(text), piece is DONE
+            if isinstance(piece, Exception):
+                if text:
+                    return "".join(text), False
+                raise piece
+            if piece:
+                text.append(piece)
+                if on_token is not None:
+                    on_token(piece)
+
+    def answer(self, message, on_token=None):
+        key = self.cache_key(message)
+        if not key:
+            return None
+        answer = self.cached(key)
+        if answer is not None:
+            if on_token is not None:
+                on_token(answer)
+            return answer
+        if not self.breaker.allow():
+            return None
+
+        deadline = time.monotonic() + self.budget
+        try:
+            text, complete = self.stream(message, deadline, on_token)
+        except (requests.RequestException, ValueError):
+            self.breaker.record(False)
+            return None
+        # running out of budget counts as a failure of the model
+        self.breaker.record(complete)
+        text = text.strip()
+        if complete and text:
+            self.store(key, text)
+        return text or None
@@ -0,0 +1,71 @@
+import sys
+import json
+import time
+import random
+import asyncio
+
+from server import percentile
+
+
+MESSAGES = [
+    "Hello!", "How are you doing?", "What is your name?", "I love code palace",
+    "What do you like to eat?", "Tell me a joke", "Can you help me?",
+    "What's the weather forecast?", "Goodbye, see you", "blah blah",
+]
+
+
+async def client(host, port, messages, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for message in messages:
+        start = time.perf_counter()
+        writer.write((message + "\n").encode())
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"exit\n")
+    await writer.drain()
+    writer.close()
+
+
+async def run(host="127.0.0.1", port=8765, sessions=100, messages=100, seed=0):
+    """Opens `sessions` concurrent sessions that each send `messages`
+    messages one after the other; returns client-side latency figures.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, [rng.choice(MESSAGES) for _ in range(messages)], latencies)
+        for _ in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run_local(sessions, messages):
+    from server import ChatServer
+
+    server = ChatServer(port=0)
+    await server.start()
+    result = await run(port=server.port, sessions=sessions, messages=messages)
+    result["server"] = server.stats()
+    server.server.close()
+    await server.server.wait_closed()
+    return result
+
+
+if __name__ == "__main__":
+    # python loadgen.py [sessions] [messages] [port]; without a port a
+    # server is started in-process
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    if len(sys.argv) > 3:
+        result = asyncio.run(run(port=int(sys.argv[3]), sessions=sessions, messages=messages))
+    else:
+        result = asyncio.run(run_local(sessions, messages))
+    print(json.dumps(result, indent=2))
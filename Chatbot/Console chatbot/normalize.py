@@ -0,0 +1,112 @@
+import re
+from functools import lru_cache
+
+
+# la fel ca in get_response, plus "!"
+TOKEN_SPLIT = re.compile(r'\s+|[,;?.!-]\s*?')
+REPEATED = re.compile(r'(\w)\1{2,}')
+SUFFIXES = ("ing", "ed", "es", "s", "ly")
+# "his" must not become "hi", nor "seed" "see"
+MIN_STEM_LENGTH = 3
+
+
+def tokenize(text):
+    """Lowercases `text` and splits it into words, without empty ones.
+    """
+    return [word for word in TOKEN_SPLIT.split(text.lower()) if word]
+
+
+def stems(word):
+    """Candidate base forms of `word`, most literal first: "eating" gives
+    "eating", "eat", "eate"; "running" also gives "run".
+    """
+    yield word
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and \
+                len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            stem = word[:-len(suffix)]
+            if suffix == "s" and stem.endswith("s"):
+                continue
+            yield stem
+            yield stem + "e"
+            if len(stem) > MIN_STEM_LENGTH and stem[-1] == stem[-2]:
+                yield stem[:-1]
+
+
+def deletes(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def within_one_edit(a, b):
+    """True if `a` and `b` differ by at most one insertion, deletion,
+    substitution or swap of adjacent letters.
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 1 or (
+            len(diff) == 2 and diff[1] == diff[0] + 1
+            and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    if len(a) > len(b):
+        a, b = b, a
+    return any(b[:i] + b[i + 1:] == a for i in range(len(b)))
+
+
+class Normalizer:
+    """Maps message words onto the keywords of the rules.
+
+    A word is tried as is, with runs of 3+ equal letters collapsed
+    ("hellooo"), and as its stems ("eating"). Failing that, a keyword at
+    most one edit away is found through a SymSpell-style index: every
+    keyword is stored under itself and each of its one-letter deletions,
+    so the candidates of a word are the keywords sharing one of its
+    deletions, without scanning the vocabulary. Short words (under
+    `min_fuzzy_length` letters) are only matched exactly, so "hell" does
+    not become "hello". Nothing is fuzzily mapped onto a `required` word
+    either: that would let "same" pass the required "name" of a rule.
+    Results are cached per word.
+    """
+
+    def __init__(self, vocabulary, required=(), min_fuzzy_length=5,
+                 cache_size=65536):
+        self.vocabulary = frozenset(vocabulary)
+        self.min_fuzzy_length = min_fuzzy_length
+        self.deletions = {}
+        required = frozenset(required)
+        for keyword in self.vocabulary:
+            if len(keyword) < self.min_fuzzy_length or keyword in required:
+                continue
+            for key in deletes(keyword) | {keyword}:
+                self.deletions.setdefault(key, set()).add(keyword)
+        self.normalize_word = lru_cache(maxsize=cache_size)(self.lookup)
+
+    def fuzzy(self, word):
+        candidates = set()
+        for key in deletes(word) | {word}:
+            candidates |= self.deletions.get(key, set())
+        matches = sorted(
+            keyword for keyword in candidates if within_one_edit(word, keyword))
+        return matches[0] if matches else None
+
+    def lookup(self, word):
+        forms = [word]
+        collapsed = REPEATED.sub(r'\1', word)
+        if collapsed != word:
+            forms.append(collapsed)
+        for form in forms:
+            for stem in stems(form):
+                if stem in self.vocabulary:
+                    return stem
+        if len(word) < self.min_fuzzy_length:
+            return word
+        for form in forms:
+            match = self.fuzzy(form)
+            if match is not None:
+                return match
+        return word
+
+    def normalize(self, words):
+        return [self.normalize_word(word) for word in words]
@@ -0,0 +1,77 @@
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Streams a canned answer the way Ollama's /api/generate does, one
+    word per line in its own HTTP chunk, `delay` seconds apart.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        stub = self.server
+        stub.requests += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if stub.fail:
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = (stub.answer or f"You said: {body['prompt']}").split(" ")
+        try:
+            for i, word in enumerate(words):
+                time.sleep(stub.delay)
+                piece = word if i == 0 else " " + word
+                chunk = {"model": body["model"], "response": piece, "done": False}
+                self.write_chunk(json.dumps(chunk).encode() + b"\n")
+            done = {"model": body["model"], "response": "", "done": True}
+            self.write_chunk(json.dumps(done).encode() + b"\n")
+            self.write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OllamaStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, answer=None, delay=0.0, fail=False):
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.answer = answer
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 11434
+    with OllamaStub(port, delay=0.05) as stub:
+        print("Ollama stub listening on", stub.url)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
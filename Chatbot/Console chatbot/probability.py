@@ -1,100 +1,67 @@
-import re
-from responses import get_custom_response, unknown
-RULES = [
-    {
-        "keywords": ["hello", "hi", "hey", "salut"],
-        "response": "Hello! 😊",
-        "single_response": True
-    },
-    {
-        "keywords": ["how", "are", "you", "doing"],
-        "required": ["you"],
-        "response": "I'm doing fine, and you?"
-    },
-    {
-        "keywords": ["what", "is", "your", "name"],
-        "required": ["name"],
-        "response": "I'm CodePal, your friendly chatbot 🤖"
-    },
-    {
-        "keywords": ["i", "love", "code", "palace"],
-        "required": ["code"],
-        "response": "Thank you! ❤️"
-    },
-    {
-        "keywords": ["what", "you", "eat", "like"],
-        "required": ["eat"],
-        "response": get_custom_response("eat")
-    },
-    {
-        "keywords": ["bye", "goodbye", "see"],
-        "response": "Goodbye! 👋",
-        "single_response": True
-    },
-    {
-        "keywords": ["help", "assist", "support"],
-        "response": "How can I assist you today?",
-        "single_response": True
-    },
-    {
-        "keywords": ["joke", "funny"],
-        "response": "Why don't programmers like nature? It has too many bugs! 😂",
-        "single_response": True
-    },
-    {
-        "keywords": ["weather", "forecast"],
-        "response": "I can't check the weather, but I hope it's nice where you are! ☀️",
-        "single_response": True
-    },
-    {
-        "keywords": [],
-        "response": unknown(),
-        "single_response": True
-    }
-]
+import os
+from normalize import tokenize
+from responses import unknown
+from rule_index import RuleBase
+
+# regulile sunt citite din rules.json si reincarcate cand fisierul se schimba
+RULE_BASE = RuleBase(os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json"))
 
 def message_probability(user_message, keywords, single_response=False, required=[]):
+    # pt fiecare cuvant din mesaj care apare in keywords, message_certainty este incrementat
+    message_certainty = 0
+    for word in user_message:
+        if word in keywords:
+            message_certainty += 1
+
+    # match_ratio este raportul dintre message_certainty și numărul de cuvinte din keywords
+    # dacă keywords este gol, match_ratio este 0
+    match_ratio = message_certainty / len(keywords) if keywords else 0
 
-    #TODO: Calculează probabilitatea mesajului message_certainty
-    #pt fiecare cuvant din mesaj care apare in recognised_words
-    #message_certainty este incrementat
-    
-    #TODO: Calculează match_ratio ca raportul dintre message_certainty și numărul de cuvinte din keywords
-    #dacă keywords este gol, setăm match_ratio la 0
-    
-    
     if required:
         if not all(word in user_message for word in required):
             return 0
-    match_ratio = match_ratio
     if single_response:
         return 1 if match_ratio > 0 else 0
     return int(match_ratio * 100) if match_ratio > 0 else 0
 
-def check_all_messages(message):
-    highest_prob = 0
-    best_response = None
+# modelul (ex. OllamaFallback) intrebat cand nicio regula nu se potriveste; None = doar unknown()
+FALLBACK = None
+
+def check_all_messages(message, user_input=None, index=None, on_token=None):
+    # scoring prin index: doar regulile care au cel putin un cuvant comun cu mesajul
+    index = index or RULE_BASE.index
+    best_response = index.best_response(message)
+    if best_response is None:
+        if FALLBACK is not None and user_input:
+            # on_token primeste bucatile raspunsului pe masura ce sosesc
+            answer = FALLBACK.answer(user_input, on_token)
+            if answer:
+                return answer
+        return unknown()
+    return best_response
 
-    for rule in RULES:
-        None
-        
-        #TODO: Calculează probabilitatea mesajului pentru fiecare regulă
-        #folosind funcția message_probability definită mai sus
-        
-        #TODO: dacă prob este mai mare decât highest_prob,
-        # actualizează best_response și highest_prob
-        
-        
-    #TODO: returneaza raspunsul, fie cel de eroare, fie cel gasit 
-    
+def get_response(user_input, on_token=None):
+    # mesaj gol sau doar spații
+    if not user_input or not user_input.strip():
+        return unknown()
 
-def get_response(user_input):
-    None
-    #TODO: Verifică dacă user_input este gol sau conține doar spații
+    # împarte mesajul în cuvinte, fara cuvintele goale, apoi le aduce la
+    # forma cuvintelor cheie ("eating" -> "eat", "hellooo" -> "hello");
+    # indexul e citit o singura data, ca un reload sa nu amestece
+    # normalizatorul vechi cu regulile noi
+    index = RULE_BASE.index
+    split_message = index.normalizer.normalize(tokenize(user_input))
+    return check_all_messages(split_message, user_input, index, on_token)
 
-    #TODO: apeleaza functia split pentru a împărți mesajul în cuvinte 
-    
-    # apoi returneaza rezultatul obtinut folosind check_all_messages pentru a verifica mesajul
+def get_responses(batch):
+    # ca get_response, pentru multe mesaje odata (ex. evaluare pe loguri de chat):
+    # toate mesajele sunt evaluate intr-o singura trecere prin index
+    index = RULE_BASE.index
+    messages = [index.normalizer.normalize(tokenize(user_input or "")) for user_input in batch]
+    return [
+        index.responses[rule_id]() if rule_id >= 0 else unknown()
+        for rule_id in index.best_rules(messages).tolist()
+    ]
 
 # Ce inseamna \s+|[,;?.-]\s*?
 # \s+ înseamnă unul sau mai multe spații albe (inclusiv tab-uri și linii noi)
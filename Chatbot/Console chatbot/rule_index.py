@@ -0,0 +1,298 @@
+import os
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from normalize import Normalizer
+from responses import get_custom_response, unknown
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+def compile_response(spec):
+    """Turns the "response" of a rule into a callable, evaluated each time
+    the rule answers: a string, a list of strings (one picked at random),
+    {"custom": topic} for `get_custom_response` or {"unknown": true}.
+    """
+    if isinstance(spec, str):
+        return lambda: spec
+    if isinstance(spec, list):
+        return lambda: random.choice(spec)
+    if isinstance(spec, dict) and "custom" in spec:
+        return lambda: get_custom_response(spec["custom"])
+    if isinstance(spec, dict) and spec.get("unknown"):
+        return unknown
+    if callable(spec):
+        return spec
+    raise ValueError(f"Invalid rule response: {spec!r}")
+
+
+def load_rules(path):
+    """Reads a list of rules from a JSON file, or YAML if PyYAML is
+    installed and the file ends in .yaml/.yml.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is needed to load YAML rules")
+            try:
+                rules = yaml.safe_load(file)
+            except yaml.YAMLError as error:
+                raise ValueError(f"{path}: {error}") from error
+        else:
+            rules = json.load(file)
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a list of rules")
+    for position, rule in enumerate(rules):
+        problem = rule_problem(rule)
+        if problem is not None:
+            raise ValueError(f"{path}: rule {position}: {problem}")
+    return rules
+
+
+def is_word_list(value):
+    return isinstance(value, list) and all(isinstance(word, str) for word in value)
+
+
+def rule_problem(rule):
+    """Returns what is wrong with `rule`, or None if `RuleIndex` can
+    compile it.
+    """
+    if not isinstance(rule, dict):
+        return "expected an object"
+    if not is_word_list(rule.get("keywords")):
+        return '"keywords" must be a list of words'
+    if not is_word_list(rule.get("required", [])):
+        return '"required" must be a list of words'
+    if "response" not in rule:
+        return 'missing "response"'
+    response = rule["response"]
+    if isinstance(response, list) and not (response and is_word_list(response)):
+        return '"response" lists must hold at least one string'
+    try:
+        compile_response(response)
+    except ValueError as error:
+        return str(error)
+    return None
+
+
+class RuleIndex:
+    """Inverted index over chatbot rules: word -> ids of the rules whose
+    keywords contain it.
+
+    A message is scored by walking the index for its words, so only the
+    rules sharing at least one word with it are looked at. The scores are
+    the same as `message_probability` gives for every rule, and on a tie
+    the earlier rule wins, as in a scan of `RULES`.
+
+    The best rule of a message is cached by its sorted words (scores don't
+    depend on word order); the response callable still runs on every hit,
+    so random responses stay random.
+    """
+
+    def __init__(self, rules, cache_size=65536):
+        self.rules = list(rules)
+        self.postings = defaultdict(list)
+        self.sizes = []
+        self.required = []
+        self.single = []
+        self.responses = []
+        for rule_id, rule in enumerate(self.rules):
+            keywords = rule["keywords"]
+            for word in set(keywords):
+                self.postings[word].append(rule_id)
+            self.sizes.append(len(keywords))
+            self.required.append(frozenset(rule.get("required", ())))
+            self.single.append(rule.get("single_response", False))
+            self.responses.append(compile_response(rule["response"]))
+        # built with the index, so a reload brings a matching vocabulary
+        self.normalizer = Normalizer(
+            self.postings, required=frozenset().union(*self.required))
+        self.cached_best_rule = lru_cache(maxsize=cache_size)(self.best_rule)
+        self.arrays = None
+
+    def hits(self, message):
+        """Returns {rule_id: number of message words among its keywords}.
+        """
+        counts = defaultdict(int)
+        for word in message:
+            for rule_id in self.postings.get(word, ()):
+                counts[rule_id] += 1
+        return counts
+
+    def probability(self, rule_id, count, words):
+        if not self.required[rule_id] <= words:
+            return 0
+        if self.single[rule_id]:
+            return 1
+        return int(count / self.sizes[rule_id] * 100)
+
+    def best_rule(self, message):
+        """Returns the id of the most probable rule, or None.
+        """
+        words = set(message)
+        best_rule = None
+        highest_prob = 0
+        for rule_id, count in self.hits(message).items():
+            prob = self.probability(rule_id, count, words)
+            if prob > highest_prob or (prob == highest_prob and prob > 0
+                                       and rule_id < best_rule):
+                best_rule = rule_id
+                highest_prob = prob
+        return best_rule
+
+    def best_response(self, message):
+        rule_id = self.cached_best_rule(tuple(sorted(message)))
+        return None if rule_id is None else self.responses[rule_id]()
+
+    def compile_arrays(self):
+        """CSR-style arrays of the index for `best_rules`: word id ->
+        slice of rule ids, for keywords and for required words.
+        """
+        if self.arrays is not None:
+            return self.arrays
+        words = set(self.postings)
+        for required in self.required:
+            words |= required
+        word_ids = {word: i for i, word in enumerate(sorted(words))}
+
+        def csr(postings):
+            lengths = np.zeros(len(word_ids), dtype=np.int64)
+            rule_ids = [[] for _ in word_ids]
+            for word, rules in postings.items():
+                rule_ids[word_ids[word]] = rules
+                lengths[word_ids[word]] = len(rules)
+            starts = np.concatenate(([0], np.cumsum(lengths)))
+            flat = np.array([r for rules in rule_ids for r in rules], dtype=np.int64)
+            return starts, flat
+
+        required_postings = defaultdict(list)
+        for rule_id, required in enumerate(self.required):
+            for word in required:
+                required_postings[word].append(rule_id)
+        self.arrays = {
+            "word_ids": word_ids,
+            "keywords": csr(self.postings),
+            "required": csr(required_postings),
+            "sizes": np.array(self.sizes, dtype=np.float64),
+            "required_sizes": np.array([len(r) for r in self.required], dtype=np.int64),
+            "single": np.array(self.single, dtype=bool),
+        }
+        return self.arrays
+
+    def pair_counts(self, message_ids, word_ids, csr):
+        """Sparse (message x word) @ (word x rule): returns the sorted keys
+        (message id * number of rules + rule id) of the non-zero entries
+        and their counts.
+        """
+        starts, flat = csr
+        lengths = starts[word_ids + 1] - starts[word_ids]
+        rows = np.repeat(message_ids, lengths)
+        # position of every posting entry: its word's start plus 0..length-1
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        rules = flat[np.repeat(starts[word_ids], lengths) + offsets]
+        return np.unique(rows * len(self.rules) + rules, return_counts=True)
+
+    def best_rules(self, messages):
+        """Returns the best rule id of every message (-1 for none) in one
+        pass over the index, with the same scores as `best_rule`.
+        """
+        arrays = self.compile_arrays()
+        word_ids = arrays["word_ids"]
+        occurrences = [
+            (i, word_ids[word]) for i, message in enumerate(messages)
+            for word in message if word in word_ids
+        ]
+        best = np.full(len(messages), -1, dtype=np.int64)
+        if not occurrences or not self.rules:
+            return best
+        message_ids, words = np.array(occurrences, dtype=np.int64).T
+        keys, counts = self.pair_counts(message_ids, words, arrays["keywords"])
+        rows, rules = keys // len(self.rules), keys % len(self.rules)
+
+        # required words count once per message, however often they appear
+        unique = np.unique(message_ids * len(word_ids) + words)
+        req_keys, req_counts = self.pair_counts(
+            unique // len(word_ids), unique % len(word_ids), arrays["required"])
+        if len(req_keys):
+            found = np.minimum(np.searchsorted(req_keys, keys), len(req_keys) - 1)
+            required_hits = np.where(req_keys[found] == keys, req_counts[found], 0)
+        else:
+            required_hits = np.zeros(len(keys), dtype=np.int64)
+        satisfied = required_hits == arrays["required_sizes"][rules]
+
+        probs = np.where(
+            arrays["single"][rules], 1,
+            (counts / arrays["sizes"][rules] * 100).astype(np.int64))
+        probs = np.where(satisfied, probs, 0)
+
+        keep = probs > 0
+        rows, rules, probs = rows[keep], rules[keep], probs[keep]
+        # per message: highest probability, then lowest rule id
+        order = np.lexsort((rules, -probs, rows))
+        rows, rules = rows[order], rules[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        best[rows[first]] = rules[first]
+        return best
+
+
+class RuleBase:
+    """The `RuleIndex` compiled from a rules file, rebuilt when the file
+    changes.
+
+    A reload builds the new index completely before replacing `index`, so
+    a message being answered uses either the old rules or the new ones,
+    never a mix. A file that fails to load leaves the old index in place.
+    """
+
+    def __init__(self, path, poll_interval=1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.stamp = self.file_stamp()
+        self.index = RuleIndex(load_rules(path))
+        self.watcher = None
+
+    def file_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        """Returns True if the rules were reloaded.
+        """
+        try:
+            stamp = self.file_stamp()
+            if stamp == self.stamp:
+                return False
+            # a broken file is reported once, not on every poll
+            self.stamp = stamp
+            index = RuleIndex(load_rules(self.path))
+        except Exception as error:
+            # Whatever is wrong with the file, the watcher thread must live
+            # on to pick up the next save.
+            print(f"Could not reload {self.path}: {error}")
+            return False
+        self.index = index
+        return True
+
+    def watch(self):
+        """Polls the rules file from a daemon thread.
+        """
+        if self.watcher is not None:
+            return
+
+        def poll():
+            while True:
+                time.sleep(self.poll_interval)
+                self.reload_if_changed()
+
+        self.watcher = threading.Thread(target=poll, daemon=True)
+        self.watcher.start()
@@ -0,0 +1,132 @@
+import sys
+import json
+import time
+import asyncio
+import itertools
+from collections import deque
+
+import probability
+from probability import RULE_BASE, get_response
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Session:
+    """State of one connected user."""
+
+    def __init__(self, session_id, history_size=20):
+        self.id = session_id
+        self.started = time.time()
+        self.messages = 0
+        self.history = deque(maxlen=history_size)
+
+
+class ChatServer:
+    """Serves the chatbot to many users at once over a line protocol: every
+    line received is a message, every line sent back a response. "exit"
+    ends the session and "/stats" returns the server statistics as JSON.
+
+    Rule scoring takes microseconds, so it runs on the event loop. With a
+    model fallback enabled (`probability.FALLBACK`) a response can block
+    for the whole latency budget, so it runs on `executor` (the loop's
+    default executor when None) instead; a given `executor` is always
+    used.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, executor=None,
+                 respond=get_response, latency_window=10000):
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.respond = respond
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.requests = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.started = time.perf_counter()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "sessions": len(self.sessions),
+            "requests": self.requests,
+            "requests_per_second": round(self.requests / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 0.50) * 1000, 3),
+            "p99_ms": round(percentile(self.latencies, 0.99) * 1000, 3),
+        }
+
+    async def answer(self, message):
+        if self.executor is None and probability.FALLBACK is None:
+            return self.respond(message)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.respond, message)
+
+    async def handle(self, reader, writer):
+        session = Session(next(self.session_ids))
+        self.sessions[session.id] = session
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = line.decode("utf-8", errors="replace").strip()
+                if message == "exit":
+                    break
+                if message == "/stats":
+                    writer.write((json.dumps(self.stats()) + "\n").encode())
+                    await writer.drain()
+                    continue
+
+                start = time.perf_counter()
+                response = await self.answer(message)
+                self.latencies.append(time.perf_counter() - start)
+                self.requests += 1
+                session.messages += 1
+                session.history.append((message, response))
+
+                writer.write((response.replace("\n", " ") + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.id]
+            writer.close()
+
+
+async def report(server, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print(json.dumps(server.stats()))
+
+
+async def serve(port, interval=10.0):
+    server = ChatServer(port=port)
+    await server.start()
+    RULE_BASE.watch()
+    print(f"Chatbot listening on {server.host}:{server.port}")
+    reporter = asyncio.create_task(report(server, interval))
+    try:
+        async with server.server:
+            await server.server.serve_forever()
+    finally:
+        reporter.cancel()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    try:
+        asyncio.run(serve(port))
+    except KeyboardInterrupt:
+        pass
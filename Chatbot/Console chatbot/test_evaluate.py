@@ -0,0 +1,35 @@
+import os
+
+import evaluate
+from rule_index import RuleIndex
+
+
+def test_evaluate_uses_the_given_index_only(monkeypatch):
+    class Untouchable:
+        @property
+        def index(self):
+            raise AssertionError("evaluate() used the global rule base")
+
+    monkeypatch.setattr(evaluate, "RULE_BASE", Untouchable())
+    rules = evaluate.synthetic_rules(200)
+    corpus = evaluate.synthetic_corpus(rules, 300)
+    result = evaluate.evaluate(corpus, RuleIndex(rules))
+
+    assert result["messages"] == 300
+    assert 0 < result["accuracy"] <= 1
+    wrong = sum(result["confusion"].values())
+    assert round(1 - wrong / 300, 4) == result["accuracy"]
+    latency = result["latency"]
+    assert 0 < latency["p50_us"] <= latency["p90_us"] <= latency["p99_us"] <= latency["max_us"]
+
+
+def test_corpus_evaluation():
+    result = evaluate.evaluate(evaluate.load_corpus(
+        os.path.join(os.path.dirname(__file__), "corpus.jsonl")))
+    assert result["messages"] == 32
+    assert result["accuracy"] > 0.8
+
+
+def test_latency_grows_slower_than_the_rule_base():
+    results = evaluate.scaling(sizes=(10, 10000), messages=500)
+    assert evaluate.sublinear(results), results
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+import probability
+from fallback import CircuitBreaker, OllamaFallback
+from ollama_stub import OllamaStub
+
+
+@pytest.fixture
+def stub():
+    with OllamaStub(delay=0.01) as stub:
+        yield stub
+
+
+def test_get_response_streams_fallback_answers(stub, monkeypatch):
+    monkeypatch.setattr(probability, "FALLBACK", OllamaFallback(url=stub.url))
+    pieces = []
+    response = probability.get_response("zzz qqq", on_token=pieces.append)
+    assert response == "You said: zzz qqq"
+    assert pieces == ["You", " said:", " zzz", " qqq"]
+
+    # rule hits never reach the model
+    assert probability.get_response("hello", on_token=pieces.append) == "Hello! 😊"
+    assert stub.requests == 1
+
+
+def test_cache_hit(stub):
+    fallback = OllamaFallback(url=stub.url)
+    assert fallback.answer("What is this?") == "You said: What is this?"
+    pieces = []
+    # same words, different case and punctuation: served from the cache
+    assert fallback.answer("what is this", pieces.append) == "You said: What is this?"
+    assert pieces == ["You said: What is this?"]
+    assert stub.requests == 1
+
+
+def test_budget_truncates_the_answer(stub):
+    stub.delay = 0.3
+    fallback = OllamaFallback(url=stub.url, budget=0.5)
+    start = time.monotonic()
+    assert fallback.answer("a b c d e f") == "You"
+    assert time.monotonic() - start < 0.65
+    # a partial answer is not cached and counts as a failure
+    assert fallback.cache == {}
+    assert fallback.breaker.failures == 1
+
+
+def test_unreachable_model_gives_no_answer():
+    fallback = OllamaFallback(url="http://127.0.0.1:1", budget=0.2)
+    assert fallback.answer("anything") is None
+
+
+def test_circuit_breaker_opens_and_closes(stub):
+    stub.fail = True
+    fallback = OllamaFallback(
+        url=stub.url, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.3))
+    for i in range(5):
+        assert fallback.answer(f"question {i}") is None
+    # open after two failures: the other calls never reached the model
+    assert stub.requests == 2
+
+    stub.fail = False
+    assert fallback.answer("still open") is None
+    assert stub.requests == 2
+    time.sleep(0.35)
+    # half open: one trial call, which succeeds and closes the circuit
+    assert fallback.answer("recovered") == "You said: recovered"
+    assert fallback.breaker.failures == 0
+    assert fallback.answer("closed again") == "You said: closed again"
+    assert stub.requests == 4
+
+
+def test_failed_trial_reopens_the_circuit(stub):
+    stub.fail = True
+    fallback = OllamaFallback(
+        url=stub.url, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.2))
+    assert fallback.answer("first") is None
+    time.sleep(0.25)
+    assert fallback.answer("trial") is None
+    assert fallback.answer("skipped") is None
+    assert stub.requests == 2
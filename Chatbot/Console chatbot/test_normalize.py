@@ -0,0 +1,71 @@
+import pytest
+
+import probability
+
+from normalize import Normalizer, tokenize, within_one_edit
+from probability import RULE_BASE
+
+
+def intent(message):
+    index = RULE_BASE.index
+    rule_id = index.best_rule(index.normalizer.normalize(tokenize(message)))
+    return None if rule_id is None else index.rules[rule_id]["intent"]
+
+
+def test_tokenize():
+    assert tokenize("Hello!! What's the weather, today?") == [
+        "hello", "what's", "the", "weather", "today"]
+    assert tokenize("   ") == []
+
+
+@pytest.mark.parametrize("word, keyword", [
+    ("hellooo", "hello"), ("heyyy", "hey"), ("eating", "eat"),
+    ("jokes", "joke"), ("liked", "like"), ("supporting", "support"),
+    ("goodbyeee", "goodbye"), ("weathr", "weather"), ("forcast", "forecast"),
+])
+def test_normalizes_onto_keywords(word, keyword):
+    assert RULE_BASE.index.normalizer.normalize_word(word) == keyword
+
+
+def test_within_one_edit():
+    assert within_one_edit("forcast", "forecast")
+    assert within_one_edit("nmae", "name")
+    assert not within_one_edit("fore", "forecast")
+
+
+def test_no_fuzzy_match_onto_required_words():
+    normalizer = Normalizer(["names", "games"], required=["names"])
+    assert normalizer.normalize_word("namez") == "namez"
+    assert normalizer.normalize_word("gamez") == "games"
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("same here", None),
+    ("what is your game", None),
+    ("hell yeah", None),
+    # too short to strip: not "hi" and "see"
+    ("his", None),
+    ("seed", None),
+    # "are you" matches exactly; "mode" must not turn into the required "code"
+    ("what mode are you in", "how_are_you"),
+])
+def test_near_misses_do_not_trigger_rules(message, expected):
+    assert intent(message) == expected
+    words = tokenize(message)
+    assert RULE_BASE.index.normalizer.normalize(words) == words
+
+
+def test_get_response_reads_the_index_once(monkeypatch):
+    class SwappingRuleBase:
+        reads = 0
+
+        @property
+        def index(self):
+            # a hot reload could land between any two reads
+            self.reads += 1
+            return RULE_BASE.index
+
+    rule_base = SwappingRuleBase()
+    monkeypatch.setattr(probability, "RULE_BASE", rule_base)
+    assert probability.get_response("hello") == "Hello! 😊"
+    assert rule_base.reads == 1
@@ -0,0 +1,50 @@
+import json
+import os
+import time
+
+import pytest
+
+from rule_index import RuleBase, load_rules
+
+GOOD = [{"keywords": ["hello"], "response": "Hi!", "single_response": True}]
+
+
+def write(path, rules, stamp):
+    path.write_text(rules if isinstance(rules, str) else json.dumps(rules))
+    # distinct mtimes, however coarse the filesystem clock is
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.mark.parametrize("rules", [
+    [{"keywords": ["hello"]}],
+    [{"keywords": "hello", "response": "Hi!"}],
+    [{"keywords": ["hello"], "required": "hello", "response": "Hi!"}],
+    [{"keywords": ["hello"], "response": []}],
+    [{"keywords": ["hello"], "response": {"nothing": 1}}],
+    ["hello"],
+    {"keywords": ["hello"]},
+])
+def test_load_rules_rejects_malformed_rules(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    write(path, rules, 1000)
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+
+
+def test_watcher_survives_a_malformed_file(tmp_path):
+    path = tmp_path / "rules.json"
+    write(path, GOOD, 1000)
+    rule_base = RuleBase(str(path), poll_interval=0.01)
+    rule_base.watch()
+
+    for stamp, bad in enumerate([[{"keywords": ["hello"]}], [{"keywords": 5, "response": "x"}], "[{"]):
+        write(path, bad, 2000 + stamp)
+        time.sleep(0.1)
+        assert rule_base.watcher.is_alive()
+        assert rule_base.index.best_response(["hello"]) == "Hi!"
+
+    write(path, [{"keywords": ["hello"], "response": "Hello again!"}], 3000)
+    deadline = time.monotonic() + 2
+    while rule_base.index.best_response(["hello"]) != "Hello again!":
+        assert time.monotonic() < deadline, "the good file was never reloaded"
+        time.sleep(0.01)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from probability import RULE_BASE, message_probability
+from rule_index import RuleIndex
+
+
+def linear_scan(rules, message):
+    """The original check_all_messages: every rule, first highest wins."""
+    highest_prob = 0
+    best_rule = None
+    for rule_id, rule in enumerate(rules):
+        prob = message_probability(
+            message, rule["keywords"], rule.get("single_response", False),
+            rule.get("required", []))
+        if prob > highest_prob:
+            highest_prob = prob
+            best_rule = rule_id
+    return best_rule
+
+
+def random_rules(count, vocabulary, rng):
+    rules = []
+    for i in range(count):
+        keywords = rng.sample(vocabulary, rng.randint(1, 6))
+        rule = {"keywords": keywords, "response": f"response {i}"}
+        if rng.random() < 0.3:
+            rule["required"] = rng.sample(keywords, min(len(keywords), rng.randint(1, 2)))
+        if rng.random() < 0.3:
+            rule["single_response"] = True
+        rules.append(rule)
+    return rules
+
+
+def random_messages(count, vocabulary, rng):
+    words = vocabulary + ["foo", "bar"]
+    return [
+        [rng.choice(words) for _ in range(rng.randint(0, 8))]
+        for _ in range(count)
+    ]
+
+
+def test_index_matches_linear_scan_on_rules_file():
+    index = RULE_BASE.index
+    rng = random.Random(1)
+    for message in random_messages(20000, sorted(index.postings), rng):
+        assert index.best_rule(message) == linear_scan(index.rules, message), message
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_index_matches_linear_scan_on_random_rules(seed):
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(60)]
+    rules = random_rules(200, vocabulary, rng)
+    index = RuleIndex(rules)
+    for message in random_messages(2000, vocabulary, rng):
+        expected = linear_scan(rules, message)
+        assert index.best_rule(message) == expected, message
+        expected_response = None if expected is None else rules[expected]["response"]
+        assert index.best_response(message) == expected_response
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_scoring_matches_best_rule(seed):
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(60)]
+    rules = random_rules(300, vocabulary, rng)
+    index = RuleIndex(rules)
+    messages = random_messages(3000, vocabulary, rng)
+    expected = [index.best_rule(message) for message in messages]
+    assert index.best_rules(messages).tolist() == [
+        -1 if rule_id is None else rule_id for rule_id in expected]
+
+
+def test_batch_scoring_edge_cases():
+    index = RuleIndex([{"keywords": ["hi"], "response": "Hi"}])
+    assert index.best_rules([]).tolist() == []
+    assert index.best_rules([[], ["foo"]]).tolist() == [-1, -1]
+    assert RuleIndex([]).best_rules([["hi"]]).tolist() == [-1]
+
+
+def test_get_responses_matches_get_response():
+    from probability import get_response, get_responses
+
+    messages = ["Hello!", "what is your name?", "tell me jokes", "weathr forcast",
+                "see you", "help", "i love code", "how are you", "zzz", ""]
+    deterministic = [get_response(message) for message in messages[:-2]]
+    assert get_responses(messages)[:-2] == deterministic
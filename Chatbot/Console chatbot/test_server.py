@@ -0,0 +1,106 @@
+import asyncio
+import json
+import socket
+import time
+
+import probability
+
+from loadgen import run
+from server import ChatServer
+
+
+async def send(reader, writer, message):
+    writer.write((message + "\n").encode())
+    await writer.drain()
+    return (await reader.readline()).decode().strip()
+
+
+async def two_sessions():
+    server = ChatServer(port=0, respond=lambda message: f"echo {message}")
+    await server.start()
+    try:
+        alice = await asyncio.open_connection(server.host, server.port)
+        bob = await asyncio.open_connection(server.host, server.port)
+
+        async def chat(name, connection):
+            return [await send(*connection, f"{name} {i}") for i in range(20)]
+
+        # both sessions at once: each must only see its own replies
+        replies = await asyncio.gather(chat("alice", alice), chat("bob", bob))
+        sessions = sorted(
+            [message for message, _ in session.history]
+            for session in server.sessions.values())
+        stats = json.loads(await send(*alice, "/stats"))
+        for _, writer in (alice, bob):
+            writer.write(b"exit\n")
+            await writer.drain()
+            writer.close()
+        return replies, sessions, stats
+    finally:
+        server.server.close()
+        await server.server.wait_closed()
+
+
+def test_sessions_get_their_own_replies():
+    replies, sessions, stats = asyncio.run(two_sessions())
+    assert replies == [
+        [f"echo {name} {i}" for i in range(20)] for name in ("alice", "bob")]
+    assert sessions == [
+        [f"alice {i}" for i in range(20)], [f"bob {i}" for i in range(20)]]
+    assert stats["sessions"] == 2
+    assert stats["requests"] == 40
+
+
+async def load():
+    server = ChatServer(port=0)
+    await server.start()
+    try:
+        return await run(port=server.port, sessions=10, messages=20)
+    finally:
+        server.server.close()
+        await server.server.wait_closed()
+
+
+def test_load_generator():
+    result = asyncio.run(load())
+    assert result["requests"] == 200
+    assert result["p99_ms"] >= result["p50_ms"] > 0
+
+
+class SlowFallback:
+    def answer(self, message, on_token=None):
+        time.sleep(0.5)
+        return "slow answer"
+
+
+def blocking_send(port, message, wait=0.0):
+    """A client on its own thread, timing its round trip itself: a blocked
+    event loop can't delay the measurement.
+    """
+    time.sleep(wait)
+    with socket.create_connection(("127.0.0.1", port)) as connection:
+        file = connection.makefile("rw", encoding="utf-8")
+        start = time.perf_counter()
+        file.write(message + "\n")
+        file.flush()
+        return file.readline().strip(), time.perf_counter() - start
+
+
+async def slow_and_fast():
+    server = ChatServer(port=0)
+    await server.start()
+    try:
+        return await asyncio.gather(
+            asyncio.to_thread(blocking_send, server.port, "zzz qqq"),
+            asyncio.to_thread(blocking_send, server.port, "hello", 0.1))
+    finally:
+        server.server.close()
+        await server.server.wait_closed()
+
+
+def test_fallback_does_not_block_other_sessions(monkeypatch):
+    monkeypatch.setattr(probability, "FALLBACK", SlowFallback())
+    (slow_reply, _), (fast_reply, elapsed) = asyncio.run(slow_and_fast())
+    assert fast_reply == "Hello! 😊"
+    assert elapsed < 0.2
+    assert slow_reply == "slow answer"
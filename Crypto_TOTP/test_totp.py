@@ -0,0 +1,225 @@
+import os
+import json
+import asyncio
+import base64
+import hashlib
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, unquote, urlparse
+
+from totp_SOLUTION import generate_otp, make_uri
+from totp_provision import provision
+from totp_verify import TOTPVerifier
+from totp_batch import as_strings, code_table, generate_otps
+from totp_store import BatchVerifier, SecretStore
+from totp_watch import CodeServer, OTPWatcher
+import totp_watch
+
+
+# RFC 6238, appendix B: seeds and (time, SHA1, SHA256, SHA512) codes, 8 digits
+SEEDS = {
+    hashlib.sha1: base64.b32encode(b"12345678901234567890").decode(),
+    hashlib.sha256: base64.b32encode(b"12345678901234567890123456789012").decode(),
+    hashlib.sha512: base64.b32encode(b"1234567890" * 6 + b"1234").decode(),
+}
+VECTORS = [
+    (59, "94287082", "46119246", "90693936"),
+    (1111111109, "07081804", "68084774", "25091201"),
+    (1111111111, "14050471", "67062674", "99943326"),
+    (1234567890, "89005924", "91819424", "93441116"),
+    (2000000000, "69279037", "90698825", "38618901"),
+    (20000000000, "65353130", "77737706", "47863826"),
+]
+DIGESTS = [hashlib.sha1, hashlib.sha256, hashlib.sha512]
+
+
+def expected_codes(digits):
+    for for_time, *codes in VECTORS:
+        for digest, code in zip(DIGESTS, codes):
+            yield digest, for_time, code[-digits:]
+
+
+class TestGenerateOTP(unittest.TestCase):
+    # ======== Step 1 ======== RFC 6238 vectors, 8 and 6 digits
+    def test_rfc_vectors_8_digits(self):
+        for digest, for_time, code in expected_codes(8):
+            with self.subTest(digest=digest.__name__, time=for_time):
+                otp = generate_otp(SEEDS[digest], 8, for_time=for_time, digest=digest)
+                self.assertEqual(str(otp).zfill(8), code)
+
+    def test_rfc_vectors_6_digits(self):
+        for digest, for_time, code in expected_codes(6):
+            with self.subTest(digest=digest.__name__, time=for_time):
+                otp = generate_otp(SEEDS[digest], 6, for_time=for_time, digest=digest)
+                self.assertEqual(str(otp).zfill(6), code)
+
+
+class TestVerifier(unittest.TestCase):
+    # ======== Step 2 ======== the cached verifier gives the same codes
+    def test_rfc_vectors(self):
+        for digits in (6, 8):
+            for digest, for_time, code in expected_codes(digits):
+                verifier = TOTPVerifier(digits=digits, digest=digest)
+                with self.subTest(digest=digest.__name__, time=for_time, digits=digits):
+                    self.assertEqual(verifier.generate(SEEDS[digest], for_time // 30), code)
+                    self.assertTrue(verifier.verify(SEEDS[digest], code, for_time))
+
+    # ======== Step 3 ======== window and wrong codes
+    def test_window(self):
+        verifier = TOTPVerifier(digits=8)
+        seed = SEEDS[hashlib.sha1]
+        self.assertEqual(verifier.match(seed, "07081804", 1111111109), 37037036)
+        self.assertEqual(verifier.match(seed, "07081804", 1111111109 + 30), 37037036)
+        self.assertIsNone(verifier.match(seed, "07081804", 1111111109 + 60))
+
+    def test_wrong_code(self):
+        verifier = TOTPVerifier(digits=8)
+        self.assertFalse(verifier.verify(SEEDS[hashlib.sha1], "07081805", 1111111109))
+        self.assertFalse(verifier.verify(SEEDS[hashlib.sha1], "", 1111111109))
+
+    def test_short_codes(self):
+        verifier = TOTPVerifier(digits=8)
+        seed = SEEDS[hashlib.sha1]
+        self.assertTrue(verifier.verify(seed, 7081804, 1111111109))
+        self.assertFalse(verifier.verify(seed, "7081804", 1111111109))
+        self.assertFalse(verifier.verify(seed, " 7081804", 1111111109))
+        self.assertFalse(verifier.verify(seed, "０7081804", 1111111109))
+        # Neither is padded up to "00000000".
+        self.assertIsNone(verifier.normalize(""))
+        self.assertIsNone(verifier.normalize(0.0))
+        self.assertEqual(verifier.normalize(0), b"00000000")
+
+
+class TestBatch(unittest.TestCase):
+    # ======== Step 4 ======== batch generation matches the vectors
+    def test_generate_otps(self):
+        for digest in DIGESTS:
+            times = [for_time for for_time, *_ in VECTORS]
+            codes = generate_otps([SEEDS[digest]] * len(times),
+                                  [t // 30 for t in times], 8, digest)
+            expected = [code for d, _, code in expected_codes(8) if d is digest]
+            self.assertEqual(as_strings(codes, 8).tolist(), expected)
+
+    def test_code_table(self):
+        table = code_table([SEEDS[hashlib.sha1]], [59 // 30, 1111111109 // 30], 8)
+        self.assertEqual(as_strings(table, 8).tolist(), [["94287082", "07081804"]])
+
+    def test_ten_digits(self):
+        seed = SEEDS[hashlib.sha1]
+        codes = generate_otps([seed], [37037036], 10)
+        expected = TOTPVerifier(digits=10).generate(seed, 37037036)
+        self.assertEqual(as_strings(codes, 10).tolist(), [expected])
+
+
+class TestStore(unittest.TestCase):
+    # ======== Step 5 ======== batch verification rejects replays
+    def test_replay(self):
+        store = SecretStore(":memory:")
+        store.add_many([("alice", SEEDS[hashlib.sha1]), ("bob", SEEDS[hashlib.sha256])])
+        batch = BatchVerifier(store, digits=8)
+        pairs = [("alice", "14050471"), ("alice", "14050471"),
+                 ("bob", "14050471"), ("carol", "14050471")]
+        self.assertEqual(batch.verify(pairs, 1111111111), [True, False, False, False])
+        self.assertEqual(batch.verify(pairs[:1], 1111111111), [False])
+        store.close()
+
+
+class TestProvisioning(unittest.TestCase):
+    # ======== Step 6 ======== otpauth URI format
+    def test_uri(self):
+        uri = urlparse(make_uri("alice@example.com", "JBSWY3DPEHPK3PXP"))
+        self.assertEqual((uri.scheme, uri.netloc), ("otpauth", "totp"))
+        self.assertEqual(unquote(uri.path), "/Google Authenticator:alice@example.com")
+        self.assertEqual(parse_qs(uri.query), {
+            "secret": ["JBSWY3DPEHPK3PXP"], "issuer": ["Google Authenticator"],
+            "digits": ["6"], "period": ["30"]})
+
+    def test_uri_escaping(self):
+        uri = make_uri("bob:admin?x=1", "JBSWY3DPEHPK3PXP", issuer="A&B Co", digits=8, period=60)
+        parsed = urlparse(uri)
+        self.assertEqual(unquote(parsed.path), "/A&B Co:bob:admin?x=1")
+        self.assertEqual(parse_qs(parsed.query)["issuer"], ["A&B Co"])
+        self.assertEqual(parse_qs(parsed.query)["digits"], ["8"])
+        self.assertEqual(parse_qs(parsed.query)["period"], ["60"])
+        self.assertNotIn(" ", uri)
+
+    # ======== Step 7 ======== one QR code per account, secrets in the store
+    def test_provision(self):
+        users = [f"user{i}@example.com" for i in range(20)]
+        store = SecretStore(":memory:")
+        with tempfile.TemporaryDirectory() as out_dir:
+            uris = provision(users, store, out_dir=out_dir, kind="svg",
+                             workers=2, chunk_size=3)
+            self.assertEqual(sorted(os.listdir(out_dir)), sorted(u + ".svg" for u in users))
+        self.assertEqual(len(uris), len(users))
+        for user_id in users:
+            secret = parse_qs(urlparse(uris[user_id]).query)["secret"][0]
+            self.assertEqual(store.get(user_id), secret)
+        store.close()
+
+
+class Stop(Exception):
+    pass
+
+
+class TestWatcher(unittest.IsolatedAsyncioTestCase):
+    # ======== Step 8 ======== the watcher wakes on every step boundary
+    async def test_wakes_at_boundaries(self):
+        now = [1111111100.5]
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+            if len(delays) == 4:
+                raise Stop()
+            now[0] += delay
+
+        seed = SEEDS[hashlib.sha1]
+        watcher = OTPWatcher({"seed": seed}, digits=8, clock=lambda: now[0])
+        counters = []
+        refresh = watcher.refresh
+
+        def record_refresh(when=None):
+            refresh(when)
+            counters.append((now[0], watcher.counter, watcher.codes["seed"]))
+
+        watcher.refresh = record_refresh
+        with mock.patch.object(totp_watch.asyncio, "sleep", fake_sleep):
+            with self.assertRaises(Stop):
+                await watcher.run()
+
+        self.assertEqual(delays, [9.5, 30, 30, 30])
+        self.assertEqual([c for _, c, _ in counters], [37037036, 37037037, 37037038, 37037039])
+        self.assertEqual([t % 30 for t, _, _ in counters[1:]], [0, 0, 0])
+        self.assertEqual(counters[0][2], "07081804")
+
+    # ======== Step 9 ======== the HTTP endpoint serves the current code
+    async def test_http_endpoint(self):
+        seed = SEEDS[hashlib.sha1]
+        watcher = OTPWatcher({"alice": seed})
+        watcher.refresh()
+        server = CodeServer(watcher, port=0)
+        await server.start()
+        try:
+            async def get(path):
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                head, body = response.split(b"\r\n\r\n", 1)
+                return head.split()[1], json.loads(body)
+
+            status, body = await get("/codes/alice")
+            self.assertEqual(status, b"200")
+            self.assertEqual(body["otp"], TOTPVerifier().generate(seed, watcher.counter))
+            self.assertEqual((await get("/codes"))[1], {"alice": body})
+            self.assertEqual((await get("/codes/bob"))[0], b"404")
+        finally:
+            server.server.close()
+            await server.server.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
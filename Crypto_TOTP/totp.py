@@ -1,6 +1,6 @@
 import sys
 import segno
-from tqdm import tqdm
+import asyncio
 import time
 
 import secrets
@@ -79,13 +79,14 @@ def get_otp(t=30):
     with open("secret.txt", "r") as f:
         secret = f.readline().strip()
 
-    while True:
-        otp = generate_otp(secret)
-        valid_secs = int(t - (time.time() % t))
-        print(f" > Generated OTP: {otp} valid for {valid_secs + 1} seconds")
-        # wait until the next time step, showing progress
-        for _ in tqdm(range(valid_secs + 1), desc="Loading…", ascii=False, ncols=75):
-            time.sleep(1)
+    # wake up only at time-step boundaries (totp_watch needs numpy, so it is
+    # imported here rather than for --generate-qr as well)
+    from totp_watch import OTPWatcher
+    watcher = OTPWatcher({"secret.txt": secret}, time_step=t, display=True)
+    try:
+        asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        pass
 
 
 # ========= main function for command handling ========
@@ -1,6 +1,6 @@
 import sys
 import segno
-from tqdm import tqdm
+import asyncio
 import time
 
 import secrets
@@ -8,28 +8,36 @@ import base64
 import hmac
 import hashlib
 import struct
+from urllib.parse import quote
 
 
 def generate_shared_secret():
     return secrets.token_bytes(10)
 
 
-def gen_qr(user_id):
-    # Example URI: otpauth://totp/Example:alice@google.com?secret=JBSWY3DPEHPK3PXP&issuer=Example
-    code1 = "otpauth://totp/Google%20Authenticator:"
-    code2 = "?secret="
-    code3 = "&issuer=Google%20Authenticator"
+def make_uri(user_id, secret, issuer="Google Authenticator", digits=6, period=30):
+    # Example URI: otpauth://totp/Example:alice@google.com?secret=JBSWY3DPEHPK3PXP&issuer=Example&digits=6&period=30
+    # issuer and account are percent-encoded, so a ":" or "?" in them can't break the URI
+    label = quote(issuer, safe="") + ":" + quote(user_id, safe="@")
+    params = "?secret=" + secret + "&issuer=" + quote(issuer, safe="")
+    params += "&digits=" + str(digits) + "&period=" + str(period)
+    return "otpauth://totp/" + label + params
 
+
+def gen_qr(user_id, store=None):
     # generate secret key
     secret = base64.b32encode(generate_shared_secret()).decode('utf-8')
     
-    uri = code1+user_id+code2+secret+code3
+    uri = make_uri(user_id, secret)
     print(" >> URI generated: ", uri)
 
-    # store secret
-    file = open("secret.txt", "w") 
-    file.write(secret)
-    file.close()
+    # store secret, in the multi-user store if one is given
+    if store is not None:
+        store.add(user_id, secret)
+    else:
+        file = open("secret.txt", "w") 
+        file.write(secret)
+        file.close()
 
     # generate qr code based on uri
     qrcode = segno.make(uri, micro=False)
@@ -58,19 +66,21 @@ def gen_qr(user_id):
 #     return otp
 
 
-def generate_otp(secret_base32, digits=6, time_step=30):
+def generate_otp(secret_base32, digits=6, time_step=30, for_time=None, digest=hashlib.sha1):
     # Step 1: Decode the base32-encoded secret string into raw bytes
     key = base64.b32decode(secret_base32, casefold=True)
 
-    # Step 2: Get the current time step
-    current_time = int(time.time())  # Current Unix time in seconds
+    # Step 2: Get the time step of for_time (default: now)
+    if for_time is None:
+        for_time = time.time()
+    current_time = int(for_time)  # Unix time in seconds
     counter = current_time // time_step  # Which 30-second window we're in
 
     # Step 3: Convert the counter to an 8-byte big-endian byte array
     counter_bytes = struct.pack(">Q", counter)
 
-    # Step 4: Create an HMAC-SHA1 hash using the secret key and the counter
-    hmac_hash = hmac.new(key, counter_bytes, hashlib.sha1).digest()
+    # Step 4: Create an HMAC-SHA1 (or digest) hash using the secret key and the counter
+    hmac_hash = hmac.new(key, counter_bytes, digest).digest()
 
     # Step 5: Dynamic offset is the last nibble (4 bits) of the HMAC
     # This chooses where to start slicing the hash
@@ -93,16 +103,18 @@ def generate_otp(secret_base32, digits=6, time_step=30):
 
 
 def get_otp(t=30):
-    file = open("secret.txt", "r")
-    secret = file.readline()
-    file.close()
-    while True:
-        otp = generate_otp(secret)
-        print(" > Generated OTP:", otp, "valid for", int(t-(time.time()%t))+1, "seconds")
-        for i in tqdm (range(int(t-(time.time()%t))+1), 
-               desc="Loading…", 
-               ascii=False, ncols=75):
-            time.sleep(1)
+    # open and read file containing secret
+    with open("secret.txt", "r") as f:
+        secret = f.readline().strip()
+
+    # wake up only at time-step boundaries (totp_watch needs numpy, so it is
+    # imported here rather than for --generate-qr as well)
+    from totp_watch import OTPWatcher
+    watcher = OTPWatcher({"secret.txt": secret}, time_step=t, display=True)
+    try:
+        asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        pass
 
 
 
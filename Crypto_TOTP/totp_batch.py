@@ -0,0 +1,123 @@
+import sys
+import time
+
+import base64
+import hmac
+import hashlib
+import struct
+
+import numpy as np
+
+
+pack_counter = struct.Struct(">Q").pack
+
+B32_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+B32_VALUES = np.full(256, 0xFF, dtype=np.uint8)
+B32_VALUES[np.frombuffer(B32_ALPHABET, dtype=np.uint8)] = np.arange(32)
+B32_VALUES[np.frombuffer(B32_ALPHABET.lower(), dtype=np.uint8)] = np.arange(32)
+
+
+# ========= dynamic truncation over many digests at once ========
+def truncate(digests, digits=6):
+    """`digests` is a (n, digest_size) uint8 array; returns n codes.
+    """
+    rows = np.arange(len(digests))
+    offsets = (digests[:, -1] & 0x0F).astype(np.intp)
+    code_int = np.zeros(len(digests), dtype=np.uint32)
+    for i in range(4):
+        code_int = (code_int << 8) | digests[rows, offsets + i]
+    # uint64: 10 ** digits overflows uint32 from 10 digits on
+    return (code_int & 0x7FFFFFFF).astype(np.uint64) % (10 ** digits)
+
+
+# ========= base32 decoding of many secrets at once ========
+def decode_secrets(secrets_base32):
+    """Returns the raw keys of `secrets_base32`.
+
+    Secrets of the same unpadded length (a multiple of 8 characters, like
+    the 16 characters `gen_qr` writes) are decoded together with NumPy;
+    anything else goes through `base64.b32decode`.
+    """
+    keys = [None] * len(secrets_base32)
+    by_length = {}
+    for i, secret in enumerate(secrets_base32):
+        by_length.setdefault(len(secret), []).append(i)
+
+    for length, indices in by_length.items():
+        values = None
+        if length and length % 8 == 0:
+            try:
+                joined = "".join(secrets_base32[i] for i in indices).encode("ascii")
+                values = B32_VALUES[np.frombuffer(joined, dtype=np.uint8)]
+            except UnicodeEncodeError:
+                pass
+        if values is None or (values == 0xFF).any():
+            for i in indices:
+                keys[i] = base64.b32decode(secrets_base32[i], casefold=True)
+            continue
+        # every character holds the low 5 bits of its value
+        bits = np.unpackbits(values.reshape(-1, 1), axis=1)[:, 3:]
+        rows = np.packbits(bits.reshape(len(indices), length * 5), axis=1)
+        for i, row in zip(indices, rows):
+            keys[i] = row.tobytes()
+    return keys
+
+
+def keyed_hmac(key, digest=hashlib.sha1):
+    return hmac.new(key, digestmod=digest)
+
+
+# ========= codes of many (secret, counter) pairs ========
+def generate_otps(secrets_base32, counters, digits=6, digest=hashlib.sha1):
+    """Returns the codes of `secrets_base32[i]` at `counters[i]` as an int
+    array. A single counter is used for every secret.
+    """
+    counters = np.broadcast_to(np.asarray(counters, dtype=np.uint64),
+                               (len(secrets_base32),))
+    packed = {}
+    buffer = bytearray()
+    for key, counter in zip(decode_secrets(secrets_base32), counters.tolist()):
+        counter_bytes = packed.get(counter)
+        if counter_bytes is None:
+            counter_bytes = packed[counter] = pack_counter(counter)
+        buffer += hmac.digest(key, counter_bytes, digest)
+    digests = np.frombuffer(bytes(buffer), dtype=np.uint8)
+    return truncate(digests.reshape(-1, digest().digest_size), digits)
+
+
+def code_table(secrets_base32, counters, digits=6, digest=hashlib.sha1):
+    """Returns a (len(secrets), len(counters)) array with the code of every
+    secret at every counter, e.g. to pre-generate the next hour of codes.
+    """
+    packed_counters = [pack_counter(int(counter)) for counter in counters]
+    buffer = bytearray()
+    for key in decode_secrets(secrets_base32):
+        # key HMAC once per secret, then copy it for every counter
+        keyed = keyed_hmac(key, digest)
+        for counter_bytes in packed_counters:
+            mac = keyed.copy()
+            mac.update(counter_bytes)
+            buffer += mac.digest()
+    digests = np.frombuffer(bytes(buffer), dtype=np.uint8)
+    codes = truncate(digests.reshape(-1, digest().digest_size), digits)
+    return codes.reshape(len(secrets_base32), len(packed_counters))
+
+
+def as_strings(codes, digits=6):
+    """Zero-pads an array of codes into strings, as typed by users.
+    """
+    return np.char.zfill(np.asarray(codes).astype(str), digits)
+
+
+# ========= command line: codes of secret.txt for the next steps ========
+if __name__ == '__main__':
+    steps = int(sys.argv[1]) if len(sys.argv) == 2 else 10
+    with open("secret.txt", "r") as f:
+        secret = f.readline().strip()
+    time_step = 30
+    current = int(time.time()) // time_step
+    counters = np.arange(current, current + steps)
+    table = as_strings(code_table([secret], counters))[0]
+    for counter, code in zip(counters.tolist(), table):
+        start = time.strftime("%H:%M:%S", time.localtime(counter * time_step))
+        print(" > From", start, "OTP:", code)
@@ -0,0 +1,53 @@
+import sys
+import time
+
+import base64
+import secrets
+
+from totp_SOLUTION import generate_otp
+from totp_verify import TOTPVerifier
+from totp_batch import generate_otps
+
+
+# ========= codes per second of the generate and verify paths ========
+def rate(function, items, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(items) / best
+
+
+def benchmark(n=20000):
+    user_secrets = [
+        base64.b32encode(secrets.token_bytes(10)).decode() for _ in range(n)
+    ]
+    now = time.time()
+    counter = int(now // 30)
+    verifier = TOTPVerifier()
+    codes = [verifier.generate(secret, counter) for secret in user_secrets]
+    pairs = list(zip(user_secrets, codes))
+
+    return {
+        "generate_otp": rate(
+            lambda items: [generate_otp(s, for_time=now) for s in items],
+            user_secrets),
+        "TOTPVerifier.generate": rate(
+            lambda items: [verifier.generate(s, counter) for s in items],
+            user_secrets),
+        "TOTPVerifier.verify": rate(
+            lambda items: [verifier.verify(s, otp, now) for s, otp in items],
+            pairs),
+        "generate_otps": rate(
+            lambda items: generate_otps(items, counter), user_secrets),
+    }
+
+
+# ========= command line: print the rates ========
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) == 2 else 20000
+    print(" >> Codes per second over", n, "secrets (best of 3)")
+    for name, per_second in benchmark(n).items():
+        print(f" > {name:<24}{per_second:>12,.0f}")
@@ -0,0 +1,76 @@
+import os
+import re
+import sys
+
+import base64
+import segno
+from tqdm import tqdm
+
+from concurrent.futures import ProcessPoolExecutor
+
+from totp_SOLUTION import generate_shared_secret, make_uri
+from totp_store import SecretStore
+
+
+# ========= one QR code per user (runs in worker processes) ========
+def qr_path(user_id, out_dir, kind="png"):
+    name = re.sub(r"[^\w.@+-]", "_", user_id)
+    return os.path.join(out_dir, f"{name}.{kind}")
+
+
+def render_qr(item):
+    uri, path, mask = item
+    qrcode = segno.make(uri, micro=False, mask=mask)
+    qrcode.save(path, scale=4)
+    return path
+
+
+# ========= provisioning many users at once ========
+def provision(user_ids, store, out_dir="qr_codes", kind="png", workers=None,
+              chunk_size=200, mask=None):
+    """Gives every user in `user_ids` a new secret and a QR code of its
+    otpauth URI in `out_dir` (PNG or SVG, by `kind`).
+
+    All secrets are written to `store` in one transaction; the QR codes are
+    rendered by a pool of `workers` processes, `chunk_size` users per task
+    so that the pool's per-task overhead is paid rarely. Choosing the QR
+    mask is most of segno's work; a fixed `mask` (0-7) renders about five
+    times faster and still scans. Returns {user_id: uri}.
+    """
+    if kind not in ("png", "svg"):
+        raise ValueError(f"Unsupported QR code format {kind!r}")
+    user_ids = list(dict.fromkeys(user_ids))
+    secrets = [
+        base64.b32encode(generate_shared_secret()).decode('utf-8')
+        for _ in user_ids
+    ]
+    store.add_many(zip(user_ids, secrets))
+
+    os.makedirs(out_dir, exist_ok=True)
+    uris = {
+        user_id: make_uri(user_id, secret)
+        for user_id, secret in zip(user_ids, secrets)
+    }
+    items = [
+        (uri, qr_path(user_id, out_dir, kind), mask)
+        for user_id, uri in uris.items()
+    ]
+    with ProcessPoolExecutor(workers) as executor:
+        for _ in tqdm(executor.map(render_qr, items, chunksize=chunk_size),
+                      total=len(items), desc="Rendering QR codes",
+                      ascii=False, ncols=75):
+            pass
+    return uris
+
+
+# ========= command line: provision the users listed in a file ========
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3) or sys.argv[2:] not in ([], ["png"], ["svg"]):
+        print(" >> Usage: python totp_provision.py [users_file] [png|svg]")
+    else:
+        with open(sys.argv[1], "r") as f:
+            user_ids = [line.strip() for line in f if line.strip()]
+        store = SecretStore()
+        uris = provision(user_ids, store, kind=(sys.argv[2:] or ["png"])[0])
+        store.close()
+        print(" >> Provisioned", len(uris), "users")
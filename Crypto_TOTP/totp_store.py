@@ -0,0 +1,164 @@
+import sys
+import time
+import sqlite3
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from totp_verify import TOTPVerifier
+
+
+# ========= secrets of many users in one SQLite file ========
+class SecretStore:
+    """Base32 secrets keyed by user id, with the last accepted time step of
+    every user so that a code can't be used twice.
+    """
+
+    def __init__(self, path="secrets.db"):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            " user_id TEXT PRIMARY KEY,"
+            " secret TEXT NOT NULL,"
+            " last_step INTEGER)")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, user_id, secret):
+        self.add_many([(user_id, secret)])
+
+    def add_many(self, users):
+        """Stores (user_id, secret) pairs in one transaction. A new secret
+        for an existing user replaces the old one and resets its last step.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO users (user_id, secret, last_step) "
+                "VALUES (?, ?, NULL)", users)
+
+    def get(self, user_id):
+        row = self.connection.execute(
+            "SELECT secret FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def get_many(self, user_ids):
+        """Returns {user_id: (secret, last_step)} for the users that exist.
+        """
+        user_ids = list(set(user_ids))
+        found = {}
+        # stay below SQLite's limit on the number of query parameters
+        for start in range(0, len(user_ids), 900):
+            chunk = user_ids[start:start + 900]
+            query = (
+                "SELECT user_id, secret, last_step FROM users "
+                f"WHERE user_id IN ({', '.join('?' * len(chunk))})")
+            for user_id, secret, last_step in self.connection.execute(query, chunk):
+                found[user_id] = (secret, last_step)
+        return found
+
+    def accept_steps(self, accepted):
+        """Records (user_id, step) pairs as used, in one transaction, and
+        returns which of them were newer than the user's last accepted step.
+        """
+        results = []
+        with self.connection:
+            for user_id, step in accepted:
+                cursor = self.connection.execute(
+                    "UPDATE users SET last_step = ? WHERE user_id = ? "
+                    "AND (last_step IS NULL OR last_step < ?)",
+                    (step, user_id, step))
+                results.append(cursor.rowcount == 1)
+        return results
+
+
+# ========= matching a chunk of codes (runs in worker processes too) ========
+verifiers = {}
+
+
+def match_chunk(settings, items, for_time):
+    verifier = verifiers.get(settings)
+    if verifier is None:
+        verifier = verifiers[settings] = TOTPVerifier(*settings)
+    return [verifier.match(secret, otp, for_time) for secret, otp in items]
+
+
+# ========= verifying many (user_id, otp) pairs in one call ========
+class BatchVerifier:
+    """Verifies (user_id, otp) pairs against a `SecretStore`.
+
+    Secrets are read with one query per batch. Batches larger than
+    `chunk_size` are split over `workers` threads or, with `processes`,
+    worker processes (HMAC-SHA1 on 8 bytes holds the GIL, so only
+    processes add throughput). Accepted steps are then written in one
+    transaction. A code whose step is not newer than the user's last
+    accepted one is rejected as a replay, including a second use within
+    the same batch.
+    """
+
+    def __init__(self, store, digits=6, time_step=30, window=1, workers=0,
+                 processes=False, chunk_size=2000):
+        self.store = store
+        self.settings = (digits, time_step, window)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.executor = None
+        if workers > 0:
+            pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            self.executor = pool(workers)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def match(self, items, for_time):
+        if self.executor is None or len(items) <= self.chunk_size:
+            return match_chunk(self.settings, items, for_time)
+        chunks = [
+            items[start:start + self.chunk_size]
+            for start in range(0, len(items), self.chunk_size)
+        ]
+        futures = [
+            self.executor.submit(match_chunk, self.settings, chunk, for_time)
+            for chunk in chunks
+        ]
+        return [step for future in futures for step in future.result()]
+
+    def verify(self, pairs, for_time=None):
+        """Returns one bool per (user_id, otp) pair, in order.
+        """
+        if for_time is None:
+            for_time = time.time()
+        pairs = list(pairs)
+        users = self.store.get_many(user_id for user_id, _ in pairs)
+
+        known = [i for i, (user_id, _) in enumerate(pairs) if user_id in users]
+        steps = self.match(
+            [(users[pairs[i][0]][0], pairs[i][1]) for i in known], for_time)
+
+        results = [False] * len(pairs)
+        accepted = []
+        last_steps = {user_id: last for user_id, (_, last) in users.items()}
+        for i, step in zip(known, steps):
+            user_id = pairs[i][0]
+            last = last_steps[user_id]
+            if step is not None and (last is None or step > last):
+                last_steps[user_id] = step
+                accepted.append((i, user_id, step))
+
+        recorded = self.store.accept_steps(
+            [(user_id, step) for _, user_id, step in accepted])
+        for (i, _, _), ok in zip(accepted, recorded):
+            results[i] = ok
+        return results
+
+
+# ========= command line: verify one code of one user ========
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(" >> Usage: python totp_store.py [user_id] [otp]")
+    else:
+        store = SecretStore()
+        valid = BatchVerifier(store).verify([(sys.argv[1], sys.argv[2])])[0]
+        print(" >> OTP is valid" if valid else " >> OTP is NOT valid")
+        store.close()
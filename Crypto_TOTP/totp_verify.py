@@ -0,0 +1,140 @@
+import sys
+import time
+import threading
+
+import base64
+import hmac
+import hashlib
+import struct
+
+from collections import OrderedDict
+
+
+pack_counter = struct.Struct(">Q").pack
+unpack_code = struct.Struct(">I").unpack_from
+
+
+# ========= verifier with cached keys and codes ========
+class TOTPVerifier:
+    """Checks TOTP codes against base32 secrets, for many users at once.
+
+    Decoding a secret and keying HMAC is done once per secret: the keyed
+    hmac object is cached (up to `max_keys` secrets, least recently used
+    dropped first) and `.copy()`-ed for every code. Codes of the steps in
+    the current window are memoised, so checking several codes of the same
+    user in the same 30 seconds costs dictionary lookups only.
+    """
+
+    def __init__(self, digits=6, time_step=30, window=1, digest=hashlib.sha1,
+                 max_keys=100_000):
+        self.digits = digits
+        self.modulo = 10 ** digits
+        self.time_step = time_step
+        # accept codes from `window` steps before and after the current one
+        self.window = window
+        self.digest = digest
+        self.max_keys = max_keys
+
+        self.keys = OrderedDict()
+        self.codes = {}  # counter -> {secret: code}
+        self.current = None
+        self.lock = threading.Lock()
+
+    def keyed_hmac(self, secret_base32):
+        with self.lock:
+            mac = self.keys.get(secret_base32)
+            if mac is not None:
+                self.keys.move_to_end(secret_base32)
+                return mac
+        key = base64.b32decode(secret_base32, casefold=True)
+        mac = hmac.new(key, digestmod=self.digest)
+        with self.lock:
+            self.keys[secret_base32] = mac
+            if len(self.keys) > self.max_keys:
+                self.keys.popitem(last=False)
+        return mac
+
+    def generate(self, secret_base32, counter):
+        """Returns the code of `counter` as a zero-padded string.
+        """
+        mac = self.keyed_hmac(secret_base32).copy()
+        mac.update(pack_counter(counter))
+        hmac_hash = mac.digest()
+        offset = hmac_hash[-1] & 0x0F
+        code_int = unpack_code(hmac_hash, offset)[0] & 0x7FFFFFFF
+        return str(code_int % self.modulo).zfill(self.digits)
+
+    def code(self, secret_base32, counter):
+        """Like `generate`, memoised for the steps of the current window.
+        """
+        codes = self.codes.get(counter)
+        if codes is None:
+            return self.generate(secret_base32, counter)
+        code = codes.get(secret_base32)
+        if code is None:
+            code = codes[secret_base32] = self.generate(secret_base32, counter)
+        return code
+
+    def roll_window(self, current):
+        """Keeps memoised codes for the steps around `current` only.
+        """
+        if current == self.current:
+            return
+        with self.lock:
+            steps = range(current - self.window, current + self.window + 1)
+            self.codes = {step: self.codes.get(step, {}) for step in steps}
+            self.current = current
+
+    def normalize(self, otp):
+        """Returns `otp` as `digits` ASCII bytes, or None if it is malformed.
+
+        Only an int is zero-padded (it cannot carry its leading zeros); a
+        string must already be exactly `digits` digits long.
+        """
+        if isinstance(otp, int) and not isinstance(otp, bool):
+            if not 0 <= otp < 10 ** self.digits:
+                return None
+            return str(otp).zfill(self.digits).encode()
+        if not isinstance(otp, str):
+            return None
+        otp = otp.strip()
+        if len(otp) != self.digits or otp.strip("0123456789"):
+            return None
+        return otp.encode()
+
+    def match(self, secret_base32, otp, for_time=None):
+        """Returns the time step `otp` is valid for, or None.
+
+        Every step of the window is compared, with `hmac.compare_digest`,
+        so the time taken does not reveal which step (if any) matched.
+        """
+        if for_time is None:
+            for_time = time.time()
+        current = int(for_time // self.time_step)
+        self.roll_window(current)
+
+        otp = self.normalize(otp)
+        if otp is None:
+            return None
+        matched = None
+        for counter in range(current - self.window, current + self.window + 1):
+            code = self.code(secret_base32, counter).encode()
+            if hmac.compare_digest(code, otp) and matched is None:
+                matched = counter
+        return matched
+
+    def verify(self, secret_base32, otp, for_time=None):
+        return self.match(secret_base32, otp, for_time) is not None
+
+
+# ========= command line: check a code against secret.txt ========
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print(" >> Usage: python totp_verify.py [otp]")
+    else:
+        with open("secret.txt", "r") as f:
+            secret = f.readline().strip()
+        if TOTPVerifier().verify(secret, sys.argv[1]):
+            print(" >> OTP is valid")
+        else:
+            print(" >> OTP is NOT valid")
@@ -0,0 +1,131 @@
+import sys
+import json
+import time
+import asyncio
+
+from totp_batch import as_strings, generate_otps
+
+
+# ========= codes of many secrets, refreshed at step boundaries ========
+class OTPWatcher:
+    """Keeps the current code of every secret in `secrets` ({name: secret}).
+
+    `run()` sleeps until the next time-step boundary, recomputes all codes
+    in one batch and sleeps again, so the codes change exactly when the
+    step does and nothing runs in between. The delay is measured from the
+    clock on every wake-up, so it does not drift. `clock` returns the Unix
+    time and can be replaced in tests.
+    """
+
+    def __init__(self, secrets, digits=6, time_step=30, display=False,
+                 clock=time.time):
+        self.secrets = dict(secrets)
+        self.clock = clock
+        self.digits = digits
+        self.time_step = time_step
+        self.display = display
+        self.counter = None
+        self.codes = {}
+
+    def refresh(self, now=None):
+        if now is None:
+            now = self.clock()
+        self.counter = int(now // self.time_step)
+        names = list(self.secrets)
+        codes = generate_otps(
+            [self.secrets[name] for name in names], self.counter, self.digits)
+        self.codes = dict(zip(names, as_strings(codes, self.digits).tolist()))
+        if self.display:
+            for name, otp in self.codes.items():
+                print(" > Generated OTP:", otp, "for", name, "valid for",
+                      self.valid_for(now), "seconds")
+
+    def valid_for(self, now=None):
+        if now is None:
+            now = self.clock()
+        return int((self.counter + 1) * self.time_step - now) + 1
+
+    def snapshot(self):
+        valid_for = self.valid_for()
+        return {
+            name: {"otp": otp, "valid_for": valid_for}
+            for name, otp in self.codes.items()
+        }
+
+    async def run(self):
+        while True:
+            self.refresh()
+            delay = (self.counter + 1) * self.time_step - self.clock()
+            await asyncio.sleep(max(delay, 0))
+
+
+# ========= local HTTP endpoint for test tooling ========
+class CodeServer:
+    """Serves the codes of an `OTPWatcher` as JSON over HTTP:
+    `GET /codes` returns all of them, `GET /codes/<name>` one.
+    """
+
+    def __init__(self, watcher, host="127.0.0.1", port=8030):
+        self.watcher = watcher
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    def route(self, path):
+        codes = self.watcher.snapshot()
+        if path in ("/codes", "/codes/"):
+            return 200, codes
+        if path.startswith("/codes/") and path[len("/codes/"):] in codes:
+            return 200, codes[path[len("/codes/"):]]
+        return 404, {"error": f"not found: {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # skip the headers, the request has no body
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2 or parts[0] != "GET":
+                status, payload = 405, {"error": "only GET is supported"}
+            else:
+                status, payload = self.route(parts[1])
+            body = json.dumps(payload).encode()
+            reason = {200: "OK", 404: "Not Found"}.get(status, "Method Not Allowed")
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def watch(secrets, port=None, display=True):
+    watcher = OTPWatcher(secrets, display=display)
+    if port is not None:
+        server = CodeServer(watcher, port=port)
+        await server.start()
+        print(" >> Serving codes on http://%s:%d/codes" % (server.host, server.port))
+    await watcher.run()
+
+
+# ========= command line: watch secret.txt, optionally serve it ========
+if __name__ == '__main__':
+    if len(sys.argv) not in (1, 3) or sys.argv[1:2] not in ([], ["--serve"]):
+        print(" >> Usage: python totp_watch.py [--serve port]")
+    else:
+        with open("secret.txt", "r") as f:
+            secret = f.readline().strip()
+        port = int(sys.argv[2]) if len(sys.argv) == 3 else None
+        try:
+            asyncio.run(watch({"secret.txt": secret}, port))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,9 @@
+import pytest
+
+from figma_stub import FigmaStubServer, png_bytes
+
+
+@pytest.fixture
+def figma_server():
+    with FigmaStubServer(images={"icon": png_bytes()}) as server:
+        yield server
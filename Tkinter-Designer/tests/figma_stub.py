@@ -0,0 +1,119 @@
+"""
+Local stand-in for the parts of the Figma REST API used by tkdesigner.
+"""
+import io
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from PIL import Image
+
+
+def png_bytes(width=40, height=20, color=(58, 127, 246, 255)):
+    content = io.BytesIO()
+    Image.new("RGBA", (width, height), color).save(content, "PNG")
+    return content.getvalue()
+
+
+class FigmaStubServer(ThreadingHTTPServer):
+    """Serves `document` from `/v1/files/<key>`, node renders from
+    `/v1/images/<key>` and the rendered PNG bytes in `images` (keyed by
+    node id) from `/images/<id>.png`.
+
+    `failures` maps a path to a list of statuses answered (with a zero
+    Retry-After) before the path starts succeeding, and every response is
+    delayed by `delay` seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, document=None, images=None, token="token"):
+        super().__init__(("127.0.0.1", 0), FigmaStubHandler)
+        self.document = document or {"document": {"children": [{"children": []}]}}
+        self.images = images or {}
+        self.token = token
+        self.failures = {}
+        self.delay = 0
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class FigmaStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode("UTF-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, e.g. in timeout tests.
+            pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append(url.path)
+        parts = url.path.strip("/").split("/")
+
+        time.sleep(self.server.delay)
+        failures = self.server.failures.get(url.path)
+        if failures:
+            status = failures.pop(0)
+            body = json.dumps({"status": status, "err": "Rate limited"}).encode()
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if parts[0] == "images" and len(parts) == 2:
+            body = self.server.images.get(parts[1][:-len(".png")])
+            if body is None:
+                return self.send_json({"status": 404, "err": "Not found"}, 404)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if self.headers.get("X-FIGMA-TOKEN") != self.server.token:
+            return self.send_json({"status": 403, "err": "Invalid token"}, 403)
+
+        if parts[:2] == ["v1", "files"]:
+            return self.send_json(self.server.document)
+        if parts[:2] == ["v1", "images"]:
+            ids = parse_qs(url.query).get("ids", [""])[0].split(",")
+            return self.send_json({
+                "err": None,
+                "images": {
+                    item_id: f"{self.server.url}/images/{item_id}.png"
+                    for item_id in ids
+                },
+            })
+        self.send_json({"status": 404, "err": "Not found"}, 404)
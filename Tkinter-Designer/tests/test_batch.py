@@ -0,0 +1,45 @@
+import json
+
+from tkdesigner.assets import ImageCache
+from tkdesigner.batch import Batch, load_manifest
+from tkdesigner.benchmark import synthetic_document, write_fixture
+from tkdesigner.figma.endpoints import Files
+
+from figma_stub import png_bytes
+
+
+def test_batch_generates_every_entry(figma_server, monkeypatch, tmp_path):
+    document = synthetic_document(2, 10)
+    write_fixture(document, tmp_path / "offline")
+    figma_server.document = document
+    for frame in document["document"]["children"][0]["children"]:
+        for child in frame["children"]:
+            figma_server.images[child["id"]] = png_bytes(160, 48)
+    monkeypatch.setattr(Files, "API_ENDPOINT_URL", figma_server.api_url)
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({
+        "defaults": {"file_url": "https://www.figma.com/file/key/Design"},
+        "entries": [
+            {"output": "ui/online"},
+            {"output": "ui/offline", "document": "offline/document.json",
+             "images": "offline/images"},
+            {"output": "ui/missing", "document": "missing.json"},
+        ],
+    }))
+    entries = load_manifest(manifest, token="token")
+    cache = ImageCache(tmp_path / "cache")
+
+    report = Batch(entries, jobs=3, image_cache=cache).run()
+
+    assert [entry["status"] for entry in report["entries"]] == [
+        "ok", "ok", "failed"]
+    assert report["frames"] == 4
+    assert (tmp_path / "ui" / "online" / "build" / "gui1.py").exists()
+    assert (tmp_path / "ui" / "offline" / "build" / "gui1.py").exists()
+    # Every image of the fixture is the same, so it is processed once per
+    # entry that misses the cache before the other one filled it.
+    cache_report = report["image_cache"]
+    assert cache_report["hits"] + cache_report["misses"] == 16
+    assert cache_report["misses"] <= 2
+    assert report["requests"]["count"] > 0
@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+from tkdesigner.figma.client import Client
+from tkdesigner.figma.endpoints import Files
+
+
+def files(figma_server, **kwargs):
+    client = Client(backoff=0.001, **kwargs)
+    return Files("token", "key", api_endpoint_url=figma_server.api_url,
+                 client=client)
+
+
+def test_retries_rate_limited_requests(figma_server):
+    figma_server.failures["/v1/files/key"] = [429, 503]
+    figma_file = files(figma_server)
+
+    assert "document" in figma_file.get_file()
+    metrics = figma_file.client.metrics
+    assert metrics.requests == 3
+    assert metrics.retries == 2
+    assert metrics.statuses == {429: 1, 503: 1, 200: 1}
+
+
+def test_gives_up_after_retries(figma_server):
+    figma_server.failures["/v1/files/key"] = [429] * 3
+    figma_file = files(figma_server, retries=2)
+
+    with pytest.raises(RuntimeError, match="429"):
+        figma_file.get_file()
+    assert figma_file.client.metrics.requests == 3
+
+
+def test_client_errors_are_not_retried(figma_server):
+    figma_file = files(figma_server)
+    figma_file.token = "wrong"
+
+    with pytest.raises(RuntimeError, match="403"):
+        figma_file.get_image("1:2")
+    assert figma_file.client.metrics.retries == 0
+
+
+def test_timeout(figma_server):
+    figma_server.delay = 0.5
+    figma_file = files(figma_server, timeout=0.05, retries=1)
+
+    with pytest.raises(RuntimeError, match="in time"):
+        figma_file.get_file()
+    assert figma_file.client.metrics.errors == 2
+
+
+def test_connect_timeout_is_a_timeout():
+    class TimingOutClient:
+        def get(self, url, **kwargs):
+            raise requests.ConnectTimeout()
+
+    figma_file = Files("token", "key", client=TimingOutClient())
+    with pytest.raises(RuntimeError, match="in time"):
+        figma_file.get_file()
@@ -0,0 +1,225 @@
+import json
+
+import pytest
+from PIL import Image
+
+import tkdesigner.figma.frame as frame_module
+from tkdesigner import designer as designer_module
+from tkdesigner.benchmark import synthetic_document, write_fixture
+from tkdesigner.designer import Designer
+from tkdesigner.figma.client import Client
+from tkdesigner.figma.endpoints import Files, LocalFiles
+
+from figma_stub import png_bytes
+
+
+def make_frame(index, elements):
+    children = []
+    for i in range(elements):
+        children.append({
+            "id": f"{index}:{i}",
+            "name": "Button" if i % 2 == 0 else "Rectangle",
+            "type": "RECTANGLE",
+            "absoluteBoundingBox": {
+                "x": 10 * i, "y": 5 * i, "width": 40, "height": 20},
+            "fills": [{"color": {"r": 0.5, "g": 0.25, "b": 1, "a": 1}}],
+        })
+    return {
+        "id": f"{index}:0",
+        "name": f"Frame {index}",
+        "type": "FRAME",
+        "absoluteBoundingBox": {"x": 0, "y": 0, "width": 640, "height": 480},
+        "fills": [{"color": {"r": 1, "g": 1, "b": 1, "a": 1}}],
+        "children": children,
+    }
+
+
+class FakeFiles:
+    client = None
+
+    def __init__(self, token, file_key):
+        self.frames = [make_frame(i, 6) for i in range(5)]
+
+    def get_file(self):
+        return {"document": {"children": [{"children": self.frames}]}}
+
+    def get_image(self, item_id, scale=2):
+        return f"https://images.example/{item_id}.png"
+
+
+class CountingFiles(FakeFiles):
+    """Streams its frames, counting how many have been read."""
+
+    def __init__(self, token, file_key):
+        self.frames = [make_frame(i, 6) for i in range(8)]
+        self.read = 0
+
+    def iter_frames(self):
+        for frame in self.frames:
+            self.read += 1
+            yield frame
+
+
+def fake_download_image(url, image_path, *args):
+    with open(image_path, "w") as file:
+        file.write(url)
+
+
+def generate(monkeypatch, output_path, workers):
+    monkeypatch.setattr(designer_module.endpoints, "Files", FakeFiles)
+    monkeypatch.setattr(frame_module, "download_image", fake_download_image)
+    designer = Designer("token", "key", output_path, workers=workers)
+    designer.design()
+    return {
+        str(path.relative_to(output_path)): path.read_text()
+        for path in sorted(output_path.rglob("*")) if path.is_file()
+    }
+
+
+def test_parallel_output_matches_serial(monkeypatch, tmp_path):
+    serial = generate(monkeypatch, tmp_path / "serial", workers=1)
+    parallel = generate(monkeypatch, tmp_path / "parallel", workers=4)
+
+    assert "gui.py" in serial and "gui4.py" in serial
+    assert serial.keys() == parallel.keys()
+    for name, content in serial.items():
+        assert parallel[name] == content.replace(
+            str(tmp_path / "serial"), str(tmp_path / "parallel"))
+
+
+def test_streamed_code_matches_rendered_code(monkeypatch, tmp_path):
+    monkeypatch.setattr(designer_module.endpoints, "Files", FakeFiles)
+    monkeypatch.setattr(frame_module, "download_image", fake_download_image)
+    designer = Designer("token", "key", tmp_path)
+    frame = designer.build_frames()[0]
+
+    frame.write_code(designer_module.TEMPLATE, tmp_path / "gui.py")
+
+    assert (tmp_path / "gui.py").read_text() == frame.to_code(
+        designer_module.TEMPLATE)
+    assert frame_module.get_template(designer_module.TEMPLATE) is \
+        frame_module.get_template(designer_module.TEMPLATE)
+
+
+def test_generate_against_stub_server(figma_server, tmp_path):
+    figma_server.document = FakeFiles("token", "key").get_file()
+    for frame in figma_server.document["document"]["children"][0]["children"]:
+        for child in frame["children"]:
+            figma_server.images[child["id"]] = png_bytes()
+    figma_file = Files("token", "key", api_endpoint_url=figma_server.api_url)
+
+    Designer(None, None, tmp_path, figma_file=figma_file).design()
+
+    assert (tmp_path / "gui4.py").exists()
+    with Image.open(tmp_path / "assets" / "frame0" / "button_1.png") as im:
+        assert im.size == (20, 10)
+    assert "/v1/files/key" in figma_server.requests
+
+
+def test_api_errors_are_not_reported_as_missing_frames(figma_server,
+                                                       tmp_path):
+    figma_server.document = FakeFiles("token", "key").get_file()
+    figma_server.failures["/v1/images/key"] = [429] * 10
+    figma_file = Files("token", "key", api_endpoint_url=figma_server.api_url,
+                       client=Client(retries=1, backoff=0.001))
+
+    with pytest.raises(RuntimeError, match="429"):
+        Designer(None, None, tmp_path, figma_file=figma_file).design()
+
+
+def test_generate_offline(tmp_path):
+    document = FakeFiles("token", "key").get_file()
+    images_path = tmp_path / "images"
+    images_path.mkdir()
+    for frame in document["document"]["children"][0]["children"]:
+        for child in frame["children"]:
+            (images_path / f"{child['id'].replace(':', '-')}.png").write_bytes(
+                png_bytes())
+    document_path = tmp_path / "document.json"
+    document_path.write_text(json.dumps(document))
+    output_path = tmp_path / "build"
+
+    figma_file = LocalFiles(document_path, images_path)
+    Designer(None, None, output_path, figma_file=figma_file).design()
+
+    assert (output_path / "gui4.py").exists()
+    assert (output_path / "assets" / "frame4" / "button_3.png").exists()
+
+
+def test_streaming_reads_a_bounded_window(monkeypatch, tmp_path):
+    monkeypatch.setattr(frame_module, "download_image", fake_download_image)
+    figma_file = CountingFiles(None, None)
+    frames = Designer(
+        None, None, tmp_path, figma_file=figma_file, streaming=True,
+        workers=4).iter_frames()
+    next(frames)
+    assert figma_file.read == 4
+    frames.close()
+
+
+def test_streaming_matches_full_document(figma_server, tmp_path):
+    figma_server.document = FakeFiles("token", "key").get_file()
+    for frame in figma_server.document["document"]["children"][0]["children"]:
+        for child in frame["children"]:
+            figma_server.images[child["id"]] = png_bytes()
+    figma_file = Files("token", "key", api_endpoint_url=figma_server.api_url)
+
+    Designer(None, None, tmp_path / "full", figma_file=figma_file).design()
+    Designer(
+        None, None, tmp_path / "stream", figma_file=figma_file,
+        streaming=True, workers=2).design()
+
+    for index in ("", "1", "4"):
+        full = (tmp_path / "full" / f"gui{index}.py").read_text()
+        stream = (tmp_path / "stream" / f"gui{index}.py").read_text()
+        assert stream == full.replace(
+            str(tmp_path / "full"), str(tmp_path / "stream"))
+
+
+def test_atlas_and_lazy_hover(tmp_path):
+    figma_file = write_fixture(synthetic_document(1, 20), tmp_path)
+    output_path = tmp_path / "build"
+
+    Designer(
+        None, None, output_path, figma_file=figma_file,
+        lazy_hover=True, atlas=True).design()
+
+    code = (output_path / "gui.py").read_text()
+    compile(code, "gui.py", "exec")
+    assert [p.name for p in (output_path / "assets" / "frame0").iterdir()] == [
+        "atlas.png"]
+    assert "relative_to_assets(\"atlas.png\")" in code
+    assert code.count("atlas_image(") == 9
+    assert "button_image_hover_" not in code
+    assert "button_1.hover_image = atlas_image(" in code
+
+
+def test_single_app_shares_assets(tmp_path):
+    figma_file = write_fixture(synthetic_document(3, 20), tmp_path)
+    output_path = tmp_path / "build"
+
+    designer = Designer(
+        None, None, output_path, figma_file=figma_file, single_app=True)
+    designer.design()
+
+    code = (output_path / "gui.py").read_text()
+    compile(code, "gui.py", "exec")
+    assert sorted(p.name for p in output_path.iterdir()) == ["assets", "gui.py"]
+    # The fixture renders every node with the same image.
+    assert len(list((output_path / "assets").iterdir())) == 1
+    assert designer.asset_store.added == 24
+    assert "def build_frame_2():" in code
+    assert "    button_1 = Button(\n        canvas," in code
+
+
+def test_single_app_over_previous_output(tmp_path):
+    figma_file = write_fixture(synthetic_document(2, 4), tmp_path)
+    output_path = tmp_path / "build"
+    Designer(None, None, output_path, figma_file=figma_file).design()
+    assert any((output_path / "assets" / "frame0").iterdir())
+
+    # A --force rerun as a single app leaves the old frame folders alone.
+    Designer(
+        None, None, output_path, figma_file=figma_file,
+        single_app=True).design()
+    compile((output_path / "gui.py").read_text(), "gui.py", "exec")
@@ -0,0 +1,60 @@
+from tkdesigner.figma.node import Node, NodeData
+from tkdesigner.figma.vector_elements import Line
+
+
+FRAME = {
+    "id": "1:0",
+    "name": "Frame",
+    "type": "FRAME",
+    "absoluteBoundingBox": {"x": 100, "y": 50, "width": 400, "height": 300},
+    "children": [
+        {
+            "id": "1:1",
+            "name": "Line",
+            "type": "LINE",
+            "absoluteBoundingBox": {"x": 110, "y": 60, "width": 20, "height": 0},
+            "strokes": [{"color": {"r": 1, "g": 0, "b": 0, "a": 1}}],
+            "strokeWeight": 2,
+            "blendMode": "PASS_THROUGH",
+            "exportSettings": [],
+        },
+        {
+            "id": "1:2",
+            "name": "Rectangle",
+            "type": "RECTANGLE",
+            "visible": False,
+            "absoluteBoundingBox": {"x": 130, "y": 80, "width": 10, "height": 5},
+            "fills": [{"type": "IMAGE"}],
+        },
+    ],
+}
+
+
+def test_node_data_precomputes_json():
+    frame = NodeData(FRAME)
+    line, rectangle = frame.children
+
+    assert (line.x, line.y, line.width, line.height) == (110, 60, 20, 0)
+    assert line.stroke_color == "#FF0000"
+    assert rectangle.fill_color == "#FFFFFF"
+    assert rectangle.visible is False
+    assert not hasattr(line, "__dict__")
+
+
+def test_node_data_get_matches_json_keys():
+    line = NodeData(FRAME).children[0]
+
+    assert line.get("strokeWeight") == 2
+    assert line.get("absoluteBoundingBox") == FRAME["children"][0]["absoluteBoundingBox"]
+    assert line.get("exportSettings") == []
+    assert line.get("blendMode") is None
+    assert line.get("cornerRadius", 0) == 0
+
+
+def test_elements_position_relative_to_frame():
+    frame = Node(FRAME)
+    line = Line(frame.node.children[0], frame)
+
+    assert (line.x, line.y) == (8, 8)
+    assert (line.width, line.height) == (22, 2)
+    assert line.fill_color == "#FF0000"
@@ -0,0 +1,32 @@
+import time
+
+from tkdesigner.profiling import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.phase("parse"):
+        profiler.count("Button")
+    assert not profiler.timings
+    assert not profiler.elements
+
+
+def test_nested_phases_are_exclusive():
+    profiler = Profiler()
+    profiler.enabled = True
+    with profiler.phase("parse"):
+        with profiler.phase("download"):
+            time.sleep(0.02)
+    assert profiler.timings["download"] >= 0.02
+    assert profiler.timings["parse"] < 0.01
+    assert profiler.calls == {"parse": 1, "download": 1}
+
+
+def test_iterate_times_production_only():
+    profiler = Profiler()
+    profiler.enabled = True
+    for _ in profiler.iterate("render", range(3)):
+        time.sleep(0.01)
+    assert profiler.calls["render"] == 4
+    assert profiler.timings["render"] < 0.01
+    assert "render" in profiler.report()
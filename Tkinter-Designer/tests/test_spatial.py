@@ -0,0 +1,39 @@
+from tkdesigner.figma.spatial import SpatialIndex, overlap
+
+
+def test_overlap():
+    assert overlap((0, 0, 10, 10), (0, 0, 10, 10)) == 1
+    assert overlap((0, 0, 10, 10), (10, 0, 10, 10)) == 0
+    assert overlap((0, 0, 10, 10), (5, 0, 10, 10)) == 50 / 150
+
+
+def test_match_tolerates_jitter():
+    index = SpatialIndex(cell_size=16)
+    index.insert((100, 40, 80, 24), "1")
+    index.insert((100, 80, 80, 24), "2")
+    index.insert((63.9, 0, 10, 10), "3")
+
+    assert index.match((100, 40, 80, 24)) == "1"
+    assert index.match((100.4, 79.7, 80, 24)) == "2"
+    assert index.match((64.2, 0.1, 10, 10)) == "3"
+    # Same corner, larger overlay (e.g. with a drop shadow).
+    assert index.match((100, 40, 120, 40)) == "1"
+    # Shifted by a few pixels but still covering the button.
+    assert index.match((102, 41, 80, 24)) == "1"
+    assert index.match((300, 300, 80, 24)) is None
+    assert index.match((140, 40, 80, 24)) is None
+
+
+def test_match_prefers_topmost_of_identical_boxes():
+    index = SpatialIndex()
+    index.insert((0, 0, 10, 10), "bottom")
+    index.insert((0, 0, 10, 10), "top")
+    assert index.match((0, 0, 10, 10)) == "top"
+
+
+def test_match_prefers_topmost_across_cells():
+    index = SpatialIndex(cell_size=64)
+    # Equally good matches; the top one also covers an earlier cell.
+    index.insert((64, 0, 8, 8), "bottom")
+    index.insert((56, 0, 8, 8), "top")
+    assert index.match((60, 0, 8, 8), min_overlap=0.3) == "top"
@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from tkdesigner.benchmark import synthetic_document
+from tkdesigner.figma.stream import iter_page_frames
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.fixture
+def document():
+    document = synthetic_document(3, 12)
+    document["document"]["children"].insert(0, {
+        "id": "0:2",
+        "name": "Page \"0\" [draft] {ignored}",
+        "children": [{"characters": "\\\"}]{[", "values": [1, -2.5e3, None, True]}],
+    })
+    document["components"] = {"1:1": {"name": "é"}}
+    return document
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_page_frames_matches_json(document, size, indent):
+    text = json.dumps(document, indent=indent, ensure_ascii=indent is None)
+    pages = document["document"]["children"]
+
+    for page in range(len(pages)):
+        frames = list(iter_page_frames(chunked(text, size), page))
+        assert frames == pages[page]["children"]
+
+
+def test_iter_page_frames_missing_page(document):
+    with pytest.raises(RuntimeError):
+        list(iter_page_frames([json.dumps(document)], 2))
+    with pytest.raises(RuntimeError):
+        list(iter_page_frames(['{"status": 403, "err": "Invalid token"}']))
@@ -1,6 +1,10 @@
 import os
+
+import pytest
+from PIL import Image
+
 from tkdesigner.constants import ASSETS_PATH
-from tkdesigner.utils import find_between, download_image
+from tkdesigner.utils import find_between, download_image, ImageOptions
 
 
 def test_assets_path():
@@ -15,8 +19,31 @@ def test_find_between():
                         ) == "/someurl.com/"
 
 
-def test_download_image():
-    url = "https://www.python.org/static/opengraph-icon-200x200.png"
-    download_image(url, "test.png")
-    assert os.path.exists("test.png")
-    os.remove("test.png")
+def test_download_image(figma_server, tmp_path):
+    url = f"{figma_server.url}/images/icon.png"
+    download_image(url, tmp_path / "test.png")
+    assert os.path.exists(tmp_path / "test.png")
+
+
+def test_download_image_options(figma_server, tmp_path):
+    url = f"{figma_server.url}/images/icon.png"
+
+    download_image(url, tmp_path / "raw.png", options=ImageOptions(scale=1))
+    assert (tmp_path / "raw.png").read_bytes() == figma_server.images["icon"]
+
+    options = ImageOptions(resample="bilinear", optimize=True, colors=16)
+    download_image(url, tmp_path / "small.png", options=options)
+    with Image.open(tmp_path / "small.png") as im:
+        assert im.size == (20, 10)
+        assert im.mode == "P"
+
+
+def test_image_options_rejects_unknown_filter():
+    with pytest.raises(ValueError):
+        ImageOptions(resample="sharpest")
+
+
+@pytest.mark.parametrize("colors", [0, 257, -1])
+def test_image_options_rejects_palette_size(colors):
+    with pytest.raises(ValueError):
+        ImageOptions(colors=colors)
@@ -0,0 +1,91 @@
+"""
+Content-addressed storage of image assets shared between frames.
+"""
+import hashlib
+import os
+import threading
+
+from pathlib import Path
+
+
+class AssetStore:
+    """Keeps one copy of every distinct image in `path`.
+
+    Images are named after the hash of their content, so an image that
+    appears in several frames (or several times in one frame) is written
+    to disk once and all elements using it refer to the same file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # Number of images added, and of distinct images actually stored.
+        self.added = 0
+        self.stored = 0
+
+    def add(self, image_path: Path) -> Path:
+        """Moves the image at `image_path` into the store, or deletes it if
+        the store already has the same image. Returns its path in the store
+        relative to the store directory.
+        """
+        image_path = Path(image_path)
+        digest = hashlib.sha256(image_path.read_bytes()).hexdigest()
+        name = Path(f"{digest[:16]}{image_path.suffix}")
+        with self.lock:
+            self.added += 1
+            if (self.path / name).exists():
+                image_path.unlink()
+            else:
+                os.replace(image_path, self.path / name)
+                self.stored += 1
+        return name
+
+
+class ImageCache:
+    """Processed images kept in `path`, keyed by the hash of the downloaded
+    image and the options it was processed with.
+
+    Shared between generations (and runs, when `path` is kept) so that an
+    image that appears in several designs is only decoded, resized and
+    encoded once.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content: bytes, options) -> Path:
+        digest = hashlib.sha256(content)
+        digest.update(repr((
+            options.scale, options.resample, options.optimize, options.colors
+        )).encode())
+        return self.path / f"{digest.hexdigest()}.png"
+
+    def copy_to(self, content: bytes, options, image_path) -> bool:
+        """Writes the cached result for `content` to `image_path`. Returns
+        False when there is none.
+        """
+        try:
+            data = self.key(content, options).read_bytes()
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return False
+        Path(image_path).write_bytes(data)
+        with self.lock:
+            self.hits += 1
+        return True
+
+    def add(self, content: bytes, options, image_path):
+        """Caches the processed image at `image_path` for `content`.
+        """
+        key = self.key(content, options)
+        # Written under a temporary name and renamed, so concurrent readers
+        # never see a partial file.
+        temporary = key.with_name(f"{key.stem}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(Path(image_path).read_bytes())
+        os.replace(temporary, key)
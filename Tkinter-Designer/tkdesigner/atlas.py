@@ -0,0 +1,60 @@
+"""
+Packing of a frame's image assets into a single sprite atlas.
+"""
+import math
+
+from PIL import Image
+
+
+# Transparent gap left around every sprite so that filtering in image
+# viewers never bleeds one sprite into the next.
+PADDING = 1
+
+
+def pack(sizes) -> tuple:
+    """Places rectangles of the given (width, height) sizes on shelves.
+
+    Returns the (x, y) position of every rectangle, in the order given,
+    and the (width, height) of the atlas they fit in.
+    """
+    if not sizes:
+        return [], (0, 0)
+
+    area = sum((w + PADDING) * (h + PADDING) for w, h in sizes)
+    widest = max(w for w, _ in sizes) + PADDING
+    max_width = max(widest, int(math.sqrt(area)))
+
+    positions = [None] * len(sizes)
+    x = y = shelf_height = width = 0
+    # Tallest first keeps the wasted space at the top of each shelf small.
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        w, h = sizes[index]
+        if x + w + PADDING > max_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        positions[index] = (x, y)
+        x += w + PADDING
+        width = max(width, x)
+        shelf_height = max(shelf_height, h + PADDING)
+    return positions, (width, y + shelf_height)
+
+
+def build_atlas(image_paths, atlas_path, optimize=False) -> list:
+    """Writes the images at `image_paths` into one PNG at `atlas_path`.
+
+    Returns the (x, y, width, height) box of every image in the atlas.
+    """
+    images = []
+    for path in image_paths:
+        with Image.open(path) as im:
+            images.append(im.convert("RGBA"))
+
+    positions, size = pack([im.size for im in images])
+    atlas = Image.new("RGBA", size, (0, 0, 0, 0))
+    boxes = []
+    for im, (x, y) in zip(images, positions):
+        atlas.paste(im, (x, y))
+        boxes.append((x, y, im.size[0], im.size[1]))
+    atlas.save(atlas_path, "PNG", optimize=optimize)
+    return boxes
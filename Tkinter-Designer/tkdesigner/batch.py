@@ -0,0 +1,207 @@
+"""
+Headless generation of many Figma files from a manifest.
+
+The manifest is a JSON file holding a list of entries, or an object with
+the entries under "entries" and defaults for them under "defaults":
+
+    {
+        "defaults": {"token": "..."},
+        "entries": [
+            {"file_url": "https://www.figma.com/file/...", "output": "ui/login"},
+            {"document": "saved/settings.json", "output": "ui/settings"}
+        ]
+    }
+
+Each entry needs an "output" folder (the code goes to its `build`
+subfolder, like with the CLI) and either a "file_url" and "token" or an
+offline "document" (and optionally "images") as read by `LocalFiles`.
+Relative paths are resolved against the manifest's folder.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import traceback
+import contextlib
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tkdesigner.assets import ImageCache
+from tkdesigner.designer import Designer
+from tkdesigner.figma.client import Client
+from tkdesigner.figma.endpoints import Files, LocalFiles
+from tkdesigner.profiling import profiler
+from tkdesigner.utils import ImageOptions, file_key_from_url
+
+
+def load_manifest(path: Path, token=None) -> list:
+    """Returns the entries of the manifest at `path`, with defaults (and
+    `token`, for entries without one) applied and paths resolved.
+    """
+    with path.open(encoding="UTF-8") as file:
+        manifest = json.load(file)
+    if isinstance(manifest, list):
+        manifest = {"entries": manifest}
+
+    defaults = manifest.get("defaults", {})
+    entries = []
+    for index, entry in enumerate(manifest.get("entries", [])):
+        entry = {**defaults, **entry}
+        if token is not None:
+            entry.setdefault("token", token)
+        if "output" not in entry:
+            raise ValueError(f"Manifest entry {index} has no `output`.")
+        if "document" not in entry and not (
+                "file_url" in entry and "token" in entry):
+            raise ValueError(
+                f"Manifest entry {index} needs a `file_url` and `token` "
+                "or a `document`.")
+        for key in ("output", "document", "images"):
+            if key in entry:
+                entry[key] = (path.parent / Path(entry[key]).expanduser()).resolve()
+        entries.append(entry)
+    return entries
+
+
+class Batch:
+    """Generates manifest entries concurrently, sharing one HTTP client
+    (and its connection pool and concurrency limit) and one cache of
+    processed images between them.
+    """
+
+    def __init__(self, entries, jobs=4, client=None, image_cache=None,
+                 image_options=None, force=False):
+        self.entries = entries
+        self.jobs = jobs
+        self.client = client or Client()
+        self.image_cache = image_cache
+        self.image_options = image_options
+        self.force = force
+
+    def figma_file(self, entry):
+        if "document" in entry:
+            images_path = entry.get("images", entry["document"].parent)
+            return LocalFiles(entry["document"], images_path)
+        return Files(
+            entry["token"].strip(), file_key_from_url(entry["file_url"]),
+            client=self.client)
+
+    def generate(self, entry) -> dict:
+        output_path = entry["output"] / "build"
+        result = {
+            "output": str(output_path),
+            "source": str(entry.get("document", entry.get("file_url"))),
+        }
+        start = time.perf_counter()
+        try:
+            if output_path.exists() and not output_path.is_dir():
+                raise RuntimeError(
+                    f"`{output_path}` already exists and is not a directory.")
+            if output_path.is_dir() and tuple(output_path.glob('*')) \
+                    and not self.force:
+                raise RuntimeError(
+                    f"Directory `{output_path}` already exists, "
+                    "pass --force to overwrite it.")
+            designer = Designer(
+                None, None, output_path, figma_file=self.figma_file(entry),
+                image_options=self.image_options,
+                image_cache=self.image_cache)
+            designer.design()
+        except Exception as error:
+            logging.info(traceback.format_exc())
+            result.update(status="failed", error=str(error))
+        else:
+            result.update(status="ok", frames=designer.frameCounter)
+        result["seconds"] = round(time.perf_counter() - start, 4)
+        return result
+
+    def run(self) -> dict:
+        """Generates every entry and returns the aggregate report.
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.jobs) as executor:
+            results = list(executor.map(self.generate, self.entries))
+
+        metrics = self.client.metrics
+        report = {
+            "entries": results,
+            "succeeded": sum(r["status"] == "ok" for r in results),
+            "failed": sum(r["status"] != "ok" for r in results),
+            "frames": sum(r.get("frames", 0) for r in results),
+            "seconds": round(time.perf_counter() - start, 4),
+            "requests": {
+                "count": metrics.requests,
+                "retries": metrics.retries,
+                "errors": metrics.errors,
+                "latency": round(metrics.latency, 4),
+            },
+        }
+        if self.image_cache is not None:
+            report["image_cache"] = {
+                "hits": self.image_cache.hits,
+                "misses": self.image_cache.misses,
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate TKinter GUI code for every entry of a manifest.")
+    parser.add_argument("manifest", type=str, help="Path to the JSON manifest.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=4,
+        help="Number of entries generated concurrently. Defaults to 4.")
+    parser.add_argument(
+        "-f", "--force", action="store_true",
+        help="Overwrite output directories that already exist.")
+    parser.add_argument(
+        "--token", type=str, default=os.getenv("FIGMA_TOKEN"),
+        help=(
+            "Figma token for entries that don't set one. "
+            "Defaults to the FIGMA_TOKEN environment variable."))
+    parser.add_argument(
+        "--cache-dir", type=str,
+        help=(
+            "Folder keeping processed images between runs. "
+            "Defaults to a temporary folder removed at exit."))
+    parser.add_argument(
+        "--scale", type=int, choices=(1, 2), default=2,
+        help="Scale images are rendered at by Figma. Defaults to 2.")
+    parser.add_argument(
+        "--report", type=str,
+        help="Also write the JSON report to this file.")
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Add the time spent in each generation phase to the output.")
+    args = parser.parse_args()
+
+    manifest_path = Path(args.manifest).expanduser().resolve()
+    entries = load_manifest(manifest_path, args.token)
+
+    profiler.enabled = args.profile
+    # Progress output goes to stderr so stdout is only the JSON report.
+    with tempfile.TemporaryDirectory() as directory, \
+            contextlib.redirect_stdout(sys.stderr):
+        cache_path = Path(args.cache_dir or directory).expanduser()
+        batch = Batch(
+            entries, jobs=args.jobs, image_cache=ImageCache(cache_path),
+            image_options=ImageOptions(scale=args.scale), force=args.force)
+        report = batch.run()
+
+    text = json.dumps(report, indent=4)
+    print(text)
+    if args.report is not None:
+        Path(args.report).write_text(text, encoding="UTF-8")
+    if args.profile:
+        print(profiler.report(), file=sys.stderr)
+
+    if report["failed"]:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Generation throughput benchmark on a synthetic Figma document.
+
+    python -m tkdesigner.benchmark --frames 10 --elements 200
+"""
+import io
+import os
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+from pathlib import Path
+
+from PIL import Image
+
+from tkdesigner.designer import Designer
+from tkdesigner.figma.endpoints import LocalFiles
+from tkdesigner.profiling import profiler
+from tkdesigner.utils import ImageOptions
+
+
+# Element kinds cycled through in every synthetic frame, in the ratio they
+# appear in typical designs. Buttons are followed by their hover overlay.
+ELEMENT_KINDS = (
+    "Rectangle", "Text", "Button", "ButtonHover", "Text", "TextBox",
+    "Image", "Line", "Rectangle", "Text")
+
+
+def synthetic_element(frame_index, index, kind):
+    x = 24 * (index % 40)
+    y = 18 * (index // 40 % 40)
+    node = {
+        "id": f"{frame_index + 1}:{index + 1}",
+        "name": kind,
+        "type": "RECTANGLE",
+        "visible": True,
+        "absoluteBoundingBox": {"x": x, "y": y, "width": 80, "height": 24},
+        "fills": [{"color": {"r": 0.23, "g": 0.5, "b": 0.96, "a": 1}}],
+    }
+    if kind == "ButtonHover":
+        # Hover overlays sit exactly on the button created just before them.
+        node["absoluteBoundingBox"]["x"] = 24 * ((index - 1) % 40)
+        node["absoluteBoundingBox"]["y"] = 18 * ((index - 1) // 40 % 40)
+    elif kind == "Text":
+        node["type"] = "TEXT"
+        node["characters"] = f"Label {index}"
+        node["style"] = {"fontFamily": "Inter", "fontSize": 14}
+    elif kind == "TextBox":
+        node["cornerRadius"] = 6
+    elif kind == "Line":
+        node["type"] = "LINE"
+        node["strokes"] = [{"color": {"r": 0, "g": 0, "b": 0, "a": 1}}]
+        node["strokeWeight"] = 1
+    return node
+
+
+def synthetic_document(frames, elements) -> dict:
+    """Returns a Figma files-endpoint response with `frames` frames of
+    `elements` elements each on its first page.
+    """
+    return {
+        "name": "Benchmark",
+        "document": {
+            "id": "0:0",
+            "type": "DOCUMENT",
+            "children": [{
+                "id": "0:1",
+                "name": "Page 1",
+                "type": "CANVAS",
+                "children": [
+                    {
+                        "id": f"{frame_index + 1}:0",
+                        "name": f"Frame {frame_index + 1}",
+                        "type": "FRAME",
+                        "absoluteBoundingBox": {
+                            "x": 0, "y": 0, "width": 1000, "height": 740},
+                        "fills": [{"color": {"r": 1, "g": 1, "b": 1, "a": 1}}],
+                        "children": [
+                            synthetic_element(
+                                frame_index, index,
+                                ELEMENT_KINDS[index % len(ELEMENT_KINDS)])
+                            for index in range(elements)
+                        ],
+                    }
+                    for frame_index in range(frames)
+                ],
+            }],
+        },
+    }
+
+
+def write_fixture(document, path: Path):
+    """Saves `document` and a render for every image-backed node under
+    `path`, in the layout read by `LocalFiles`.
+    """
+    content = io.BytesIO()
+    Image.new("RGBA", (160, 48), (58, 127, 246, 255)).save(content, "PNG")
+    png = content.getvalue()
+
+    images_path = path / "images"
+    images_path.mkdir(parents=True, exist_ok=True)
+    for frame in document["document"]["children"][0]["children"]:
+        for node in frame["children"]:
+            if node["name"] in ("Button", "ButtonHover", "TextBox", "Image"):
+                name = node["id"].replace(":", "-")
+                (images_path / f"{name}.png").write_bytes(png)
+
+    document_path = path / "document.json"
+    document_path.write_text(json.dumps(document), encoding="UTF-8")
+    return LocalFiles(document_path, images_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark code generation on a synthetic design.")
+    parser.add_argument(
+        "--frames", type=int, default=10, help="Number of frames.")
+    parser.add_argument(
+        "--elements", type=int, default=100, help="Elements per frame.")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of frames to generate concurrently.")
+    parser.add_argument(
+        "--resize-jobs", type=int, default=0,
+        help="Number of worker processes used to resize images.")
+    parser.add_argument(
+        "--scale", type=int, choices=(1, 2), default=2,
+        help="Image scale; 1 skips resizing.")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Read the document incrementally.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of timed runs.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        figma_file = write_fixture(
+            synthetic_document(args.frames, args.elements), directory)
+
+        profiler.enabled = True
+        best = None
+        for run in range(args.repeat):
+            profiler.reset()
+            start = time.perf_counter()
+            # Keep the per-element progress output out of the report.
+            with open(os.devnull, "w") as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                designer = Designer(
+                    None, None, directory / f"build{run}",
+                    workers=args.jobs, resize_workers=args.resize_jobs,
+                    figma_file=figma_file, streaming=args.stream,
+                    image_options=ImageOptions(scale=args.scale))
+                designer.design()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, profiler.report())
+
+    elapsed, report = best
+    total = args.frames * args.elements
+    print(report)
+    print(
+        f"\nBest of {args.repeat}: {elapsed:.4f}s, "
+        f"{args.frames / elapsed:.1f} frames/s, {total / elapsed:.1f} elements/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,13 @@ TKinter Designer command-line interface.
 """
 
 from tkdesigner.designer import Designer
+from tkdesigner.figma.client import Client
+from tkdesigner.figma.endpoints import Files, LocalFiles
+from tkdesigner.profiling import profiler
+from tkdesigner.utils import ImageOptions, RESAMPLING_FILTERS, file_key_from_url
 
-import re
 import os
+import time
 import logging
 import argparse
 
@@ -20,7 +24,7 @@ else:
 logging.basicConfig(level=log_level)
 
 
-def main():
+def make_parser():
     parser = argparse.ArgumentParser(
         description="Generate TKinter GUI code from Figma design.")
 
@@ -34,23 +38,120 @@ def main():
         help=(
             "If this flag is passed in, the output directory given "
             "will be overwritten if it exists."))
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help=(
+            "Number of frames to generate concurrently. "
+            "Defaults to 1 (one frame at a time)."))
+    parser.add_argument(
+        "--resize-jobs", type=int, default=0,
+        help=(
+            "Number of worker processes used to resize downloaded images. "
+            "Defaults to 0 (resize in the generating thread)."))
 
     parser.add_argument(
-        "file_url", type=str, help="File url of the Figma design.")
-    parser.add_argument("token", type=str, help="Figma token.")
+        "--stream", action="store_true",
+        help=(
+            "Read the Figma document incrementally and only decode the "
+            "frames being generated. Lowers memory use on large files."))
+    parser.add_argument(
+        "--scale", type=int, choices=(1, 2), default=2,
+        help=(
+            "Scale images are rendered at by Figma before being scaled back "
+            "down. 1 skips resizing entirely. Defaults to 2."))
+    parser.add_argument(
+        "--resample", choices=tuple(RESAMPLING_FILTERS), default="lanczos",
+        help="Filter used to scale images down. Defaults to lanczos.")
+    parser.add_argument(
+        "--optimize", action="store_true",
+        help="Spend more time encoding images to make them smaller.")
+    parser.add_argument(
+        "--colors", type=int,
+        help=(
+            "Quantise images to a palette of at most this many colors "
+            "(1-256)."))
+    parser.add_argument(
+        "--lazy-hover", action="store_true",
+        help=(
+            "Make the generated code load ButtonHover images the first time "
+            "the button is hovered instead of at startup."))
+    parser.add_argument(
+        "--atlas", action="store_true",
+        help=(
+            "Pack the images of each frame into a single atlas.png that the "
+            "generated code loads once at startup."))
+    parser.add_argument(
+        "--single-app", action="store_true",
+        help=(
+            "Generate one gui.py holding every frame, built the first time "
+            "it is shown (Ctrl+PageDown/PageUp switch frames), with "
+            "identical images stored once. Can't be combined with --atlas."))
+    parser.add_argument(
+        "--timeout", type=float, default=60,
+        help="Seconds to wait for a Figma API response. Defaults to 60.")
+    parser.add_argument(
+        "--retries", type=int, default=5,
+        help=(
+            "Times a rate limited or failed Figma API request is retried, "
+            "with exponential backoff. Defaults to 5."))
+    parser.add_argument(
+        "--profile", action="store_true",
+        help=(
+            "Print the time spent in each generation phase and the number "
+            "of elements of each type."))
+    parser.add_argument(
+        "--document", type=str,
+        help=(
+            "Generate offline from a Figma document JSON saved from the "
+            "files endpoint, instead of fetching FILE_URL."))
+    parser.add_argument(
+        "--images", type=str,
+        help=(
+            "Folder of node images for --document, named after the node id "
+            "with `:` replaced by `-` (e.g. `1-23.png`). "
+            "Defaults to the folder containing the document."))
 
+    parser.add_argument(
+        "file_url", type=str, nargs="?",
+        help="File url of the Figma design. Not needed with --document.")
+    parser.add_argument(
+        "token", type=str, nargs="?",
+        help="Figma token. Not needed with --document.")
+
+    return parser
+
+
+def open_figma_file(args, parser):
+    """Returns the figma file to generate from, its key and the token: a
+    local `--document` export, or the API file at `file_url`.
+    """
+    if args.document is not None:
+        document_path = Path(args.document).expanduser().resolve()
+        images_path = document_path.parent
+        if args.images is not None:
+            images_path = Path(args.images).expanduser().resolve()
+        return LocalFiles(document_path, images_path), None, None
+    if args.file_url is None or args.token is None:
+        parser.error("file_url and token are required without --document")
+    file_key = file_key_from_url(args.file_url)
+    token = args.token.strip()
+    client = Client(timeout=(10, args.timeout), retries=args.retries)
+    return Files(token, file_key, client=client), file_key, token
+
+
+def main():
+    parser = make_parser()
     args = parser.parse_args()
+    if args.single_app and args.atlas:
+        parser.error("--single-app can't be combined with --atlas")
+    if args.colors is not None and not 1 <= args.colors <= 256:
+        parser.error("--colors must be between 1 and 256")
 
     logging.basicConfig()
     logging.info(f"args: {args}")
 
-    match = re.search(
-        r'https://www.figma.com/(file|design)/([0-9A-Za-z]+)', args.file_url.split("?")[0])
-    if match is None:
-        raise ValueError("Invalid file URL.")
+    figma_file, file_key, token = open_figma_file(args, parser)
 
-    file_key = match.group(2).strip()
-    token = args.token.strip()
     output_path = Path(args.output.strip()).expanduser().resolve() / "build"
 
     if output_path.exists() and not output_path.is_dir():
@@ -66,10 +167,25 @@ def main():
                 print("Aborting!")
                 exit(-1)
 
-    designer = Designer(token, file_key, output_path)
+    profiler.enabled = args.profile
+    start = time.perf_counter()
+    designer = Designer(
+        token, file_key, output_path,
+        workers=args.jobs, resize_workers=args.resize_jobs,
+        figma_file=figma_file, streaming=args.stream,
+        lazy_hover=args.lazy_hover, atlas=args.atlas,
+        single_app=args.single_app,
+        image_options=ImageOptions(
+            args.scale, args.resample, args.optimize, args.colors))
     designer.design()
     print(f"\nProject successfully generated at {output_path}.\n")
 
+    if args.profile:
+        print(profiler.report())
+        if figma_file.client is not None:
+            print(f"\n{figma_file.client.metrics.report()}")
+        print(f"\nWall time: {time.perf_counter() - start:.4f}s")
+
 
 if __name__ == "__main__":
     main()
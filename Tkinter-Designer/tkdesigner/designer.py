@@ -1,38 +1,150 @@
 import tkdesigner.figma.endpoints as endpoints
-from tkdesigner.figma.frame import Frame
+from tkdesigner.figma.frame import Frame, write_template
+from tkdesigner.figma.node import Canvas, NodeData
 
-from tkdesigner.template import TEMPLATE
+from tkdesigner.assets import AssetStore
+from tkdesigner.constants import ASSETS_PATH
+from tkdesigner.template import TEMPLATE, APP_TEMPLATE
+from tkdesigner.profiling import profiler
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 
 class Designer:
-    def __init__(self, token, file_key, output_path: Path):
+    def __init__(self, token, file_key, output_path: Path, workers=1,
+                 resize_workers=0, figma_file=None, image_options=None,
+                 streaming=False, lazy_hover=False, atlas=False,
+                 single_app=False, image_cache=None):
+        if single_app and atlas:
+            raise ValueError(
+                "Frames of a single app share their assets, "
+                "they can't each be packed into an atlas.")
         self.output_path = output_path
-        self.figma_file = endpoints.Files(token, file_key)
-        self.file_data = self.figma_file.get_file()
+        # Any object with `get_file`, `iter_frames` and `get_image`, e.g.
+        # the offline `endpoints.LocalFiles`. Defaults to the Figma API.
+        if figma_file is None:
+            figma_file = endpoints.Files(token, file_key)
+        self.figma_file = figma_file
+        # When streaming, frames are read from the response one at a time
+        # during generation instead of decoding the whole document here.
+        self.page = None
+        if not streaming:
+            with profiler.phase("fetch"):
+                file_data = self.figma_file.get_file()
+            # Only the first page is generated. Parsing it into a `NodeData`
+            # tree lets the rest of the JSON document be freed right away.
+            with profiler.phase("parse"):
+                self.page = Canvas(file_data["document"]["children"][0])
         self.frameCounter = 0
+        # Frames are fetched on `workers` threads (asset downloads are
+        # network-bound) and images are resized on `resize_workers`
+        # processes. Both default to the original serial behaviour.
+        self.workers = workers
+        self.resize_workers = resize_workers
+        self.image_options = image_options
+        # Optional `assets.ImageCache` of processed images, e.g. shared by
+        # the generations of a batch.
+        self.image_cache = image_cache
+        # Startup options of the generated code: load hover images on first
+        # hover and/or read all of a frame's images from one sprite atlas.
+        self.lazy_hover = lazy_hover
+        self.atlas = atlas
+        # Generate one application building its frames on demand instead of
+        # a script per frame, with identical images stored once.
+        self.single_app = single_app
+        self.asset_store = None
+        if single_app:
+            self.asset_store = AssetStore(output_path / ASSETS_PATH)
+
+    def stream_nodes(self):
+        frames = self.figma_file.iter_frames()
+        for frame in profiler.iterate("fetch", frames):
+            with profiler.phase("parse"):
+                node = NodeData(frame)
+            yield node
+
+    def iter_nodes(self):
+        """Yield the frame nodes of the first page with their frame number.
+        """
+        nodes = self.stream_nodes() if self.page is None else self.page.children
+        for node in nodes:
+            # Frame numbers are assigned in document order before a worker
+            # picks the frame up, so that `assets/frameN` and `guiN.py` do
+            # not depend on the order in which workers finish.
+            count = self.frameCounter
+            self.frameCounter += 1
+            yield node, count
+
+    def build_frame(self, node, frame_count, resize_executor=None):
+        try:
+            return Frame(
+                node, self.figma_file, self.output_path, frame_count,
+                resize_executor=resize_executor,
+                image_options=self.image_options,
+                lazy_hover=self.lazy_hover, atlas=self.atlas,
+                asset_store=self.asset_store, image_cache=self.image_cache,
+                master="canvas" if self.single_app else None)
+        except (OSError, RuntimeError):
+            # Writing the output or talking to Figma failed; that is not a
+            # missing frame.
+            raise
+        except Exception as error:
+            raise Exception(
+                f"Frame not found in figma file or is empty: {error}"
+            ) from error
+
+    def iter_frames(self):
+        """Yield the Frame objects of the first page, in document order.
+        """
+        resize_executor = None
+        if self.resize_workers > 0:
+            resize_executor = ProcessPoolExecutor(self.resize_workers)
+        try:
+            if self.workers > 1:
+                with ThreadPoolExecutor(self.workers) as executor:
+                    # At most `workers` frames in flight: `Executor.map`
+                    # would read every node up front, defeating streaming.
+                    pending = deque()
+                    for node, count in self.iter_nodes():
+                        pending.append(executor.submit(
+                            self.build_frame, node, count, resize_executor))
+                        if len(pending) >= self.workers:
+                            yield pending.popleft().result()
+                    while pending:
+                        yield pending.popleft().result()
+            else:
+                for node, count in self.iter_nodes():
+                    yield self.build_frame(node, count, resize_executor)
+        finally:
+            if resize_executor is not None:
+                resize_executor.shutdown()
+
+    def build_frames(self) -> list:
+        """Return the Frame objects of the first page, in document order.
+        """
+        return list(self.iter_frames())
 
     def to_code(self) -> str:
         """Return main code.
         """
-        frames = [];
-        for f in self.file_data["document"]["children"][0]["children"]:
-            try:
-                frame = Frame(f, self.figma_file, self.output_path, self.frameCounter)
-            except Exception:
-                raise Exception("Frame not found in figma file or is empty")
-            frames.append(frame.to_code(TEMPLATE))
-            self.frameCounter += 1
-        return frames
+        frames = self.build_frames()
+        with profiler.phase("render"):
+            return [frame.to_code(TEMPLATE) for frame in frames]
 
 
     def design(self):
         """Write code and assets to the specified directories.
         """
-        code = self.to_code()
-        for index in range(len(code)):
+        if self.single_app:
+            write_template(
+                APP_TEMPLATE, self.output_path.joinpath("gui.py"),
+                frames=self.build_frames(), assets_path=self.asset_store.path)
+            return
+
+        for index, frame in enumerate(self.iter_frames()):
             # tutorials on youtube mention `python3 gui.py` added the below check to keep them valid
             if (index == 0):
-                self.output_path.joinpath("gui.py").write_text(code[index], encoding='UTF-8')
+                frame.write_code(TEMPLATE, self.output_path.joinpath("gui.py"))
             else:
-                self.output_path.joinpath(f"gui{index}.py").write_text(code[index], encoding='UTF-8')
+                frame.write_code(TEMPLATE, self.output_path.joinpath(f"gui{index}.py"))
@@ -0,0 +1,129 @@
+"""HTTP client shared by the Figma API endpoints and image downloads.
+"""
+import random
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Responses worth retrying: rate limited, or the server is having a moment.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class Metrics:
+    """Thread-safe request counters of a `Client`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.statuses = {}
+        self.latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency, status=None):
+        with self.lock:
+            self.requests += 1
+            self.latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if status is None:
+                self.errors += 1
+            else:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def report(self) -> str:
+        mean = self.latency / self.requests if self.requests else 0
+        statuses = ", ".join(
+            f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        return (
+            f"requests: {self.requests}, retries: {self.retries}, "
+            f"errors: {self.errors}, statuses: {{{statuses}}}\n"
+            f"latency: mean {mean:.4f}s, max {self.max_latency:.4f}s")
+
+
+def retry_after(response):
+    """Returns the delay in seconds asked for by the Retry-After header of
+    `response`, or None.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class Client:
+    """Pooled `requests` session with timeouts, retries and a concurrency
+    limit.
+
+    Connection errors and `RETRY_STATUSES` responses are retried up to
+    `retries` times. The delay doubles from `backoff` up to `max_backoff`
+    seconds, with jitter, unless the server sends Retry-After. A
+    Retry-After longer than `max_retry_after` is not waited for; the
+    response is returned as is. At most `concurrency` requests are in
+    flight at once. Waiting between retries does not count against it.
+    """
+
+    def __init__(self, timeout=(10, 60), retries=5, backoff=0.5,
+                 max_backoff=30, max_retry_after=300, concurrency=8):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.metrics = Metrics()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def delay(self, attempt) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def get(self, url, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            with self.semaphore:
+                start = time.perf_counter()
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    self.metrics.record(time.perf_counter() - start)
+                    if last_attempt:
+                        raise
+                    delay = self.delay(attempt)
+                else:
+                    self.metrics.record(
+                        time.perf_counter() - start, response.status_code)
+                    if response.status_code not in RETRY_STATUSES or last_attempt:
+                        return response
+                    delay = retry_after(response)
+                    if delay is None:
+                        delay = self.delay(attempt)
+                    elif delay > self.max_retry_after:
+                        return response
+                    response.close()
+
+            self.metrics.record_retry()
+            time.sleep(delay)
@@ -4,21 +4,39 @@ TEXT_INPUT_ELEMENT_TYPES = {
     "TextArea": "Text",
     "TextBox": "Entry"
 }
-position_id_map ={}
+
+
+def photo_image(element, indent="") -> str:
+    """Returns the code loading the image of `element`, either from its own
+    file or, once the frame is packed into an atlas, from its atlas box.
+    """
+    if element.atlas_box is None:
+        return f"""PhotoImage(
+{indent}    file=relative_to_assets("{element.image_path}"))"""
+    x, y, width, height = element.atlas_box
+    return f"atlas_image({x}, {y}, {width}, {height})"
+
+
+def master_argument(frame) -> str:
+    """Returns the leading argument placing a widget in the frame's master.
+    """
+    return "" if frame.master is None else f"\n    {frame.master},"
 
 
 class Button(Rectangle):
     def __init__(self, node, frame, image_path, *, id_):
         super().__init__(node, frame)
         self.image_path = image_path
+        self.atlas_box = None
         self.id_ = id_
-        position_id_map[(self.x, self.y)] = self.id_
+        self.master = master_argument(frame)
+        frame.button_index.insert(
+            (self.x, self.y, self.width, self.height), self.id_)
 
     def to_code(self):
         return f"""
-button_image_{self.id_} = PhotoImage(
-    file=relative_to_assets("{self.image_path}"))
-button_{self.id_} = Button(
+button_image_{self.id_} = {photo_image(self)}
+button_{self.id_} = Button({self.master}
     image=button_image_{self.id_},
     borderwidth=0,
     highlightthickness=0,
@@ -38,19 +56,38 @@ class ButtonHover(Rectangle):
     def __init__(self, node, frame, image_path):
         super().__init__(node, frame)
         self.image_path = image_path
+        self.atlas_box = None
+        # Load the hover image on the first `<Enter>` instead of at startup.
+        self.lazy = frame.lazy_hover
+        self.id_ = frame.button_index.match(
+            (self.x, self.y, self.width, self.height))
 
-        if((self.x, self.y) in position_id_map):
-            self.id_ = position_id_map[(self.x, self.y)]
-        else:
+        if self.id_ is None:
             print(
-                f"`ButtonHover` element must be placed on top of Button element with the same position.\n"
+                f"`ButtonHover` element must be placed on top of a Button element.\n"
                 "`ButtonHover` element will not be rendered") 
 
     def to_code(self):
-        if((self.x, self.y) in position_id_map):
+        if self.id_ is not None and self.lazy:
             return f"""
-button_image_hover_{self.id_} = PhotoImage(
-    file=relative_to_assets("{self.image_path}"))
+def button_{self.id_}_hover(e):
+    if not hasattr(button_{self.id_}, "hover_image"):
+        button_{self.id_}.hover_image = {photo_image(self, "        ")}
+    button_{self.id_}.config(
+        image=button_{self.id_}.hover_image
+    )
+def button_{self.id_}_leave(e):
+    button_{self.id_}.config(
+        image=button_image_{self.id_}
+    )
+
+button_{self.id_}.bind('<Enter>', button_{self.id_}_hover)
+button_{self.id_}.bind('<Leave>', button_{self.id_}_leave)
+
+"""
+        elif self.id_ is not None:
+            return f"""
+button_image_hover_{self.id_} = {photo_image(self)}
 
 def button_{self.id_}_hover(e):
     button_{self.id_}.config(
@@ -82,7 +119,7 @@ class Text(Vector):
 
     @property
     def characters(self) -> str:
-        string: str = self.node.get("characters")
+        string: str = self.node.characters
         text_case: str = self.style.get("textCase", "ORIGINAL")
 
         if text_case == "UPPER":
@@ -96,8 +133,7 @@ class Text(Vector):
 
     @property
     def style(self):
-        # TODO: Native conversion
-        return self.node.get("style")
+        return self.node.style
 
     @property
     def character_style_overrides(self):
@@ -109,7 +145,7 @@ class Text(Vector):
         return self.node.get("styleOverrideTable")
 
     def font_property(self):
-        style = self.node.get("style")
+        style = self.style
 
         font_name = style.get("fontPostScriptName")
         if font_name is None:
@@ -143,12 +179,12 @@ class Image(Vector):
         self.y += height // 2
 
         self.image_path = image_path
+        self.atlas_box = None
         self.id_ = id_
 
     def to_code(self):
         return f"""
-image_image_{self.id_} = PhotoImage(
-    file=relative_to_assets("{self.image_path}"))
+image_image_{self.id_} = {photo_image(self)}
 image_{self.id_} = canvas.create_image(
     {self.x},
     {self.y},
@@ -163,6 +199,7 @@ class TextEntry(Vector):
 
         self.id_ = id_
         self.image_path = image_path
+        self.atlas_box = None
 
         self.x, self.y = self.position(frame)
         width, height = self.size()
@@ -171,7 +208,7 @@ class TextEntry(Vector):
 
         self.bg_color = self.color()
 
-        corner_radius = self.get("cornerRadius", 0)
+        corner_radius = self.node.corner_radius or 0
         corner_radius = min(corner_radius, height / 2)
         self.entry_width = width - (corner_radius * 2)
         self.entry_height = height - 2
@@ -179,18 +216,18 @@ class TextEntry(Vector):
         self.entry_x, self.entry_y = self.position(frame)
         self.entry_x += corner_radius
 
-        self.entry_type = TEXT_INPUT_ELEMENT_TYPES.get(self.get("name"))
+        self.entry_type = TEXT_INPUT_ELEMENT_TYPES.get(self.name)
+        self.master = master_argument(frame)
 
     def to_code(self):
         return f"""
-entry_image_{self.id_} = PhotoImage(
-    file=relative_to_assets("{self.image_path}"))
+entry_image_{self.id_} = {photo_image(self)}
 entry_bg_{self.id_} = canvas.create_image(
     {self.x},
     {self.y},
     image=entry_image_{self.id_}
 )
-entry_{self.id_} = {self.entry_type}(
+entry_{self.id_} = {self.entry_type}({self.master}
     bd=0,
     bg="{self.bg_color}",
     fg="#000716",
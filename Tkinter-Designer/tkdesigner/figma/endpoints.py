@@ -1,7 +1,18 @@
 """Utility classes and functions for Figma API endpoints.
 """
+import codecs
+import json
 import requests
 
+from pathlib import Path
+
+from .client import Client
+from .stream import iter_page_frames
+
+
+# Size of the pieces large documents are read in when streaming.
+CHUNK_SIZE = 1 << 16
+
 
 class Files:
     """https://www.figma.com/developers/api#files-endpoints
@@ -9,32 +20,105 @@ class Files:
 
     API_ENDPOINT_URL = "https://api.figma.com/v1"
 
-    def __init__(self, token, file_key):
+    def __init__(self, token, file_key, api_endpoint_url=None, client=None):
         self.token = token
         self.file_key = file_key
+        if api_endpoint_url is not None:
+            self.API_ENDPOINT_URL = api_endpoint_url.rstrip("/")
+        # Shared with image downloads, so they reuse its connection pool.
+        self.client = client or Client()
 
     def __str__(self):
         return f"Files {{ Token: {self.token}, File: {self.file_key} }}"
 
-    def get_file(self) -> dict:
+    def request(self, path, **kwargs) -> requests.Response:
         try:
-            response = requests.get(
-                f"{self.API_ENDPOINT_URL}/files/{self.file_key}",
-                headers={"X-FIGMA-TOKEN": self.token}
+            response = self.client.get(
+                f"{self.API_ENDPOINT_URL}/{path}",
+                headers={"X-FIGMA-TOKEN": self.token},
+                **kwargs
             )
         except ValueError:
             raise RuntimeError(
                 "Invalid Input. Please check your input and try again.")
+        # Before ConnectionError: ConnectTimeout is a subclass of both.
+        except requests.Timeout:
+            raise RuntimeError(
+                "The Figma API did not respond in time. Please try again.")
         except requests.ConnectionError:
             raise RuntimeError(
                 "Tkinter Designer requires internet access to work.")
-        else:
-            return response.json()
 
-    def get_image(self, item_id) -> str:
-        response = requests.get(
-            f"{self.API_ENDPOINT_URL}/images/{self.file_key}?ids={item_id}&scale=2",
-            headers={"X-FIGMA-TOKEN": self.token}
-        )
+        if not response.ok:
+            try:
+                error = response.json().get("err")
+            except ValueError:
+                error = response.reason
+            response.close()
+            raise RuntimeError(
+                f"Figma API error {response.status_code}: {error}")
+        return response
+
+    def get_file(self) -> dict:
+        return self.request(f"files/{self.file_key}").json()
+
+    def iter_frames(self, page=0):
+        """Yields the frames of page `page` as they are downloaded, without
+        decoding the rest of the document.
+        """
+        with self.request(f"files/{self.file_key}", stream=True) as response:
+            decoder = codecs.getincrementaldecoder("UTF-8")()
+            chunks = (
+                decoder.decode(chunk)
+                for chunk in response.iter_content(CHUNK_SIZE))
+            yield from iter_page_frames(chunks, page)
+
+    def get_image(self, item_id, scale=2) -> str:
+        response = self.request(
+            f"images/{self.file_key}?ids={item_id}&scale={scale}")
 
         return response.json()["images"][item_id]
+
+
+class LocalFiles:
+    """Offline stand-in for `Files`.
+
+    Reads a document previously saved from the files endpoint and serves
+    node renders from a local directory, where the image of node `1:23` is
+    `1-23.png` (`:` is not allowed in file names on every platform).
+    Images are expected to be saved at the scale generation is run with.
+    """
+
+    def __init__(self, document_path, images_path):
+        self.document_path = Path(document_path)
+        self.images_path = Path(images_path)
+        # Images are read from disk, there is no HTTP client to share.
+        self.client = None
+
+    def __str__(self):
+        return (
+            f"LocalFiles {{ Document: {self.document_path}, "
+            f"Images: {self.images_path} }}")
+
+    def get_file(self) -> dict:
+        try:
+            with self.document_path.open(encoding="UTF-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            raise RuntimeError(
+                f"Could not read Figma document `{self.document_path}`.")
+
+    def iter_frames(self, page=0):
+        try:
+            with self.document_path.open(encoding="UTF-8") as file:
+                chunks = iter(lambda: file.read(CHUNK_SIZE), "")
+                yield from iter_page_frames(chunks, page)
+        except OSError:
+            raise RuntimeError(
+                f"Could not read Figma document `{self.document_path}`.")
+
+    def get_image(self, item_id, scale=2) -> str:
+        image_path = self.images_path / f"{item_id.replace(':', '-')}.png"
+        if not image_path.is_file():
+            raise RuntimeError(f"No image for node `{item_id}` in `{self.images_path}`.")
+        return image_path.resolve().as_uri()
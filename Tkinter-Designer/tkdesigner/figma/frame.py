@@ -1,24 +1,65 @@
+from ..atlas import build_atlas
 from ..constants import ASSETS_PATH
-from ..utils import download_image
+from ..profiling import profiler
+from ..utils import download_image, ImageOptions
 
 from .node import Node
+from .spatial import SpatialIndex
 from .vector_elements import Line, Rectangle, UnknownElement
 from .custom_elements import Button, Text, Image, TextEntry, ButtonHover
 
-from jinja2 import Template
+from functools import lru_cache
+from jinja2 import Environment
 from pathlib import Path
 
 
+# Shared by every frame so that each template source is compiled only once.
+environment = Environment()
+
+
+@lru_cache(maxsize=None)
+def get_template(source):
+    """Returns the compiled jinja2 Template for `source`.
+    """
+    return environment.from_string(source)
+
+
+def write_template(template, path: Path, **context):
+    """Renders `template` straight to `path`, without building the whole
+    file in memory first.
+    """
+    chunks = get_template(template).generate(**context)
+    with path.open("w", encoding="UTF-8") as file:
+        for chunk in profiler.iterate("render", chunks):
+            with profiler.phase("write"):
+                file.write(chunk)
+
+
 class Frame(Node):
-    def __init__(self, node, figma_file, output_path, frameCount=0):
+    def __init__(self, node, figma_file, output_path, frameCount=0, *,
+                 resize_executor=None, image_options=None, lazy_hover=False,
+                 atlas=False, asset_store=None, master=None,
+                 image_cache=None):
         super().__init__(node)
 
         self.width, self.height = self.size()
         self.bg_color = self.color()
 
         self.counter = {}
+        # Boxes of the frame's Buttons and their ids, for ButtonHover
+        # lookups. Kept per frame so frames can be generated concurrently.
+        self.button_index = SpatialIndex()
 
         self.figma_file = figma_file
+        self.resize_executor = resize_executor
+        self.image_options = image_options or ImageOptions()
+        self.image_cache = image_cache
+        self.lazy_hover = lazy_hover
+        # Images are moved into `asset_store` when given, to be shared with
+        # other frames. `master` is the widget that Buttons and entries are
+        # created in, the default Tk root when None.
+        self.asset_store = asset_store
+        self.master = master
 
         self.output_path: Path = output_path
         self.assets_path: Path = output_path / ASSETS_PATH / f"frame{frameCount}"
@@ -26,15 +67,38 @@ class Frame(Node):
         self.output_path.mkdir(parents=True, exist_ok=True)
         self.assets_path.mkdir(parents=True, exist_ok=True)
 
-        self.elements = [
-            self.create_element(child)
-            for child in self.children
-            if Node(child).visible
-        ]
+        with profiler.phase("parse"):
+            self.elements = [
+                self.create_element(child)
+                for child in self.children
+                if child.visible
+            ]
+        for element in self.elements:
+            profiler.count(type(element).__name__)
+
+        if self.asset_store is not None:
+            # All images now live in the store. The frame folder is only left
+            # behind when an earlier (--force overwritten) run filled it.
+            if not any(self.assets_path.iterdir()):
+                self.assets_path.rmdir()
+            self.assets_path = self.asset_store.path
+
+        # Name of the sprite atlas the frame's images are packed into.
+        self.atlas = None
+        if atlas:
+            self.pack_atlas()
+
+    def store_image(self, image_path: Path) -> Path:
+        """Returns the path generated code loads `image_path` from, relative
+        to the assets folder.
+        """
+        if self.asset_store is None:
+            return image_path.relative_to(self.assets_path)
+        return self.asset_store.add(image_path)
 
     def create_element(self, element):
-        element_name = element["name"].strip().lower()
-        element_type = element["type"].strip().lower()
+        element_name = element.name.strip().lower()
+        element_type = element.type.strip().lower()
 
         print(
             "Creating Element "
@@ -44,13 +108,18 @@ class Frame(Node):
         if element_name == "button":
             self.counter[Button] = self.counter.get(Button, 0) + 1
 
-            item_id = element["id"]
-            image_url = self.figma_file.get_image(item_id)
+            item_id = element.id
+            with profiler.phase("image_url"):
+                image_url = self.figma_file.get_image(
+                    item_id, self.image_options.scale)
             image_path = (
                 self.assets_path / f"button_{self.counter[Button]}.png")
-            download_image(image_url, image_path)
+            download_image(
+                image_url, image_path, self.resize_executor,
+                self.image_options, self.figma_file.client,
+                self.image_cache)
 
-            image_path = image_path.relative_to(self.assets_path)
+            image_path = self.store_image(image_path)
 
             return Button(
                 element, self, image_path, id_=f"{self.counter[Button]}")
@@ -59,13 +128,18 @@ class Frame(Node):
         elif element_name == "buttonhover":
             self.counter[ButtonHover] = self.counter.get(ButtonHover, 0) + 1
 
-            item_id = element["id"]
-            image_url = self.figma_file.get_image(item_id)
+            item_id = element.id
+            with profiler.phase("image_url"):
+                image_url = self.figma_file.get_image(
+                    item_id, self.image_options.scale)
             image_path = (
                 self.assets_path / f"button_hover_{self.counter[ButtonHover]}.png")
-            download_image(image_url, image_path)
+            download_image(
+                image_url, image_path, self.resize_executor,
+                self.image_options, self.figma_file.client,
+                self.image_cache)
 
-            image_path = image_path.relative_to(self.assets_path)
+            image_path = self.store_image(image_path)
 
             return ButtonHover(
                 element, self, image_path)
@@ -73,13 +147,18 @@ class Frame(Node):
         elif element_name in ("textbox", "textarea"):
             self.counter[TextEntry] = self.counter.get(TextEntry, 0) + 1
 
-            item_id = element["id"]
-            image_url = self.figma_file.get_image(item_id)
+            item_id = element.id
+            with profiler.phase("image_url"):
+                image_url = self.figma_file.get_image(
+                    item_id, self.image_options.scale)
             image_path = (
                 self.assets_path / f"entry_{self.counter[TextEntry]}.png")
-            download_image(image_url, image_path)
+            download_image(
+                image_url, image_path, self.resize_executor,
+                self.image_options, self.figma_file.client,
+                self.image_cache)
 
-            image_path = image_path.relative_to(self.assets_path)
+            image_path = self.store_image(image_path)
 
             return TextEntry(
                 element, self, image_path, id_=f"{self.counter[TextEntry]}")
@@ -87,12 +166,17 @@ class Frame(Node):
         elif element_name == "image":
             self.counter[Image] = self.counter.get(Image, 0) + 1
 
-            item_id = element["id"]
-            image_url = self.figma_file.get_image(item_id)
+            item_id = element.id
+            with profiler.phase("image_url"):
+                image_url = self.figma_file.get_image(
+                    item_id, self.image_options.scale)
             image_path = self.assets_path / f"image_{self.counter[Image]}.png"
-            download_image(image_url, image_path)
+            download_image(
+                image_url, image_path, self.resize_executor,
+                self.image_options, self.figma_file.client,
+                self.image_cache)
 
-            image_path = image_path.relative_to(self.assets_path)
+            image_path = self.store_image(image_path)
 
             return Image(
                 element, self, image_path, id_=f"{self.counter[Image]}")
@@ -112,32 +196,55 @@ class Frame(Node):
                 "Would be displayed as Black Rectangle")
             return UnknownElement(element, self)
 
+    def pack_atlas(self, name="atlas.png"):
+        """Packs the images of all elements into one atlas image, so that
+        the generated code opens and decodes a single file at startup.
+        """
+        elements = [
+            element for element in self.elements
+            if getattr(element, "image_path", None) is not None
+        ]
+        if not elements:
+            return
+
+        with profiler.phase("resize"):
+            image_paths = [
+                self.assets_path / element.image_path for element in elements]
+            boxes = build_atlas(
+                image_paths, self.assets_path / name,
+                self.image_options.optimize)
+        for element, box, image_path in zip(elements, boxes, image_paths):
+            element.atlas_box = box
+            image_path.unlink()
+        self.atlas = name
+
     @property
     def children(self):
-        # TODO: Convert nodes to Node objects before returning a list of them.
-        return self.node.get("children")
+        return self.node.children
 
     def color(self) -> str:
         """Returns HEX form of element RGB color (str)
         """
-        try:
-            color = self.node["fills"][0]["color"]
-            r, g, b, *_ = [int(color.get(i, 0) * 255) for i in "rgba"]
-            return f"#{r:02X}{g:02X}{b:02X}"
-        except Exception:
-            return "#FFFFFF"
+        return self.node.fill_color
 
     def size(self) -> tuple:
         """Returns element dimensions as width (int) and height (int)
         """
-        bbox = self.node["absoluteBoundingBox"]
-        width = bbox["width"]
-        height = bbox["height"]
-        return int(width), int(height)
+        return int(self.node.width), int(self.node.height)
 
     def to_code(self, template):
-        t = Template(template)
-        return t.render(
+        t = get_template(template)
+        with profiler.phase("render"):
+            return t.render(
+                window=self, elements=self.elements,
+                assets_path=self.assets_path)
+
+    def write_code(self, template, path: Path):
+        """Renders the frame straight to `path`, without building the whole
+        file in memory first.
+        """
+        write_template(
+            template, path,
             window=self, elements=self.elements, assets_path=self.assets_path)
 
 
@@ -1,24 +1,120 @@
-class Node:
+def hex_color(paints) -> str:
+    """Returns HEX form of the first paint's RGB color (str)
+    """
+    try:
+        color = paints[0]["color"]
+        r, g, b, *_ = [int(color.get(i, 0) * 255) for i in "rgba"]
+        return f"#{r:02X}{g:02X}{b:02X}"
+    except Exception:
+        return "#FFFFFF"
+
+
+class NodeData:
+    """A Figma node parsed once from the document JSON.
+
+    Holds the bounding box, colors and text style precomputed, and the
+    children as `NodeData`. Of the remaining keys only those in
+    `EXTRA_KEYS` are kept, the rest of the JSON object is dropped.
+    """
+
+    __slots__ = (
+        "id", "name", "type", "visible", "x", "y", "width", "height",
+        "fill_color", "stroke_color", "stroke_weight", "corner_radius",
+        "characters", "style", "children", "extra")
+
+    # JSON keys readable with `get` and the attribute they are parsed into.
+    ATTRIBUTES = {
+        "id": "id",
+        "name": "name",
+        "type": "type",
+        "visible": "visible",
+        "strokeWeight": "stroke_weight",
+        "cornerRadius": "corner_radius",
+        "characters": "characters",
+        "style": "style",
+        "children": "children",
+    }
+
+    EXTRA_KEYS = (
+        "pluginData", "sharedPluginData", "componentId", "exportSettings",
+        "backgroundColor", "prototypeStartNodeID", "size", "relativeTransform",
+        "rectangleCornerRadii", "characterStyleOverrides", "styleOverrideTable")
+
     def __init__(self, node: dict):
+        self.id = node.get("id")
+        self.name = node.get("name")
+        self.type = node.get("type")
+        self.visible = node.get("visible", True)
+
+        bbox = node.get("absoluteBoundingBox")
+        if bbox is None:
+            self.x = self.y = self.width = self.height = None
+        else:
+            self.x = bbox["x"]
+            self.y = bbox["y"]
+            self.width = bbox["width"]
+            self.height = bbox["height"]
+
+        self.fill_color = hex_color(node.get("fills"))
+        self.stroke_color = hex_color(node.get("strokes"))
+        self.stroke_weight = node.get("strokeWeight")
+        self.corner_radius = node.get("cornerRadius")
+        self.characters = node.get("characters")
+        self.style = node.get("style")
+
+        children = node.get("children")
+        if children is not None:
+            children = [NodeData(child) for child in children]
+        self.children = children
+
+        extra = {key: node[key] for key in self.EXTRA_KEYS if key in node}
+        self.extra = extra or None
+
+    def get(self, key, default=None):
+        """Returns the value of JSON key `key`, like `dict.get`.
+        """
+        if key == "absoluteBoundingBox":
+            value = self.bounding_box
+        elif key in self.ATTRIBUTES:
+            value = getattr(self, self.ATTRIBUTES[key])
+        elif self.extra is not None:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+
+    @property
+    def bounding_box(self):
+        if self.x is None:
+            return None
+        return {
+            "x": self.x, "y": self.y,
+            "width": self.width, "height": self.height}
+
+
+class Node:
+    def __init__(self, node):
+        if not isinstance(node, NodeData):
+            node = NodeData(node)
         self.node = node
 
     @property
     def id(self) -> str:
-        return self.node.get("id")
+        return self.node.id
 
     @property
     def name(self) -> str:
-        return self.node.get("name")
+        return self.node.name
 
     @property
     def visible(self) -> bool:
         """Whether or not the node is visible on the canvas.
         """
-        return self.node.get("visible", True)
+        return self.node.visible
 
     @property
     def type(self) -> str:
-        return self.node.get("type")
+        return self.node.type
 
     @property
     def plugin_data(self):
@@ -39,8 +135,7 @@ class Document(Node):
 
     @property
     def children(self):
-        # TODO: Convert nodes to Node objects before returning a list of them.
-        return self.node.get("children")
+        return self.node.children
 
 
 class Canvas(Node):
@@ -49,8 +144,7 @@ class Canvas(Node):
 
     @property
     def children(self):
-        # TODO: Convert nodes to Node objects before returning a list of them.
-        return self.node.get("children")
+        return self.node.children
 
     @property
     def background_color(self):
@@ -79,8 +173,7 @@ class Slice(Node):
 
     @property
     def absolute_bounding_box(self):
-        # TODO: Native conversion
-        return self.node.get("absoluteBoundingBox")
+        return self.node.bounding_box
 
     @property
     def size(self):
@@ -0,0 +1,73 @@
+"""Grid index of element boxes, for matching overlapping elements.
+"""
+import math
+
+
+def overlap(a, b) -> float:
+    """Returns the intersection over union of two (x, y, width, height)
+    boxes.
+    """
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class SpatialIndex:
+    """Boxes bucketed into a uniform grid of `cell_size` pixel cells.
+
+    A lookup only looks at the boxes in the cells its own box covers, so it
+    costs about the same however many boxes a frame has.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        # Insertion order, for ties between boxes registered in other cells.
+        self.inserted = 0
+
+    def cell_range(self, box, margin=0):
+        x, y, width, height = box
+        size = self.cell_size
+        for cx in range(math.floor((x - margin) / size),
+                        math.floor((x + width + margin) / size) + 1):
+            for cy in range(math.floor((y - margin) / size),
+                            math.floor((y + height + margin) / size) + 1):
+                yield cx, cy
+
+    def insert(self, box, value):
+        entry = (self.inserted, tuple(box), value)
+        self.inserted += 1
+        for cell in self.cell_range(box):
+            self.cells.setdefault(cell, []).append(entry)
+
+    def candidates(self, box, margin=0):
+        seen = set()
+        for cell in self.cell_range(box, margin):
+            for entry in self.cells.get(cell, ()):
+                if entry[0] not in seen:
+                    seen.add(entry[0])
+                    yield entry
+
+    def match(self, box, tolerance=1.0, min_overlap=0.8):
+        """Returns the value of the box best matching `box`, or None.
+
+        A box matches when its top-left corner is within `tolerance` pixels
+        of the one of `box` (the way a hover overlay is placed on its
+        button, allowing for float jitter), or when the two overlap by at
+        least `min_overlap` of their union. Closest corners win, then the
+        largest overlap, then the box inserted last (topmost).
+        """
+        best, best_key = None, None
+        for order, other, value in self.candidates(box, tolerance):
+            distance = max(abs(other[0] - box[0]), abs(other[1] - box[1]))
+            ratio = overlap(box, other)
+            if distance > tolerance and ratio < min_overlap:
+                continue
+            key = (min(distance, tolerance + 1), -ratio, -order)
+            if best_key is None or key < best_key:
+                best, best_key = value, key
+        return best
@@ -0,0 +1,195 @@
+"""Incremental reading of Figma files-endpoint responses.
+
+Walks the JSON text chunk by chunk and only decodes the frames of one page,
+skipping everything else without building Python objects for it.
+"""
+import json
+import re
+
+
+NON_SPACE = re.compile(r"\S")
+STRING_TOKEN = re.compile(r'["\\]')
+CONTAINER_TOKEN = re.compile(r'["\[\]{}]')
+SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JSONScanner:
+    """Cursor over a JSON document arriving as an iterable of str chunks.
+
+    `buffer[pos:]` is the text not consumed yet. Values being skipped are
+    dropped from the buffer as they are scanned, so skipping a value of
+    any size only holds about one chunk in memory.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = ""
+        self.pos = 0
+
+    def read_more(self) -> int:
+        """Appends the next chunk, dropping the consumed text. Returns by
+        how much indices into the buffer have shifted.
+        """
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            raise ValueError("Unexpected end of JSON document.")
+        shift = self.pos
+        self.buffer = self.buffer[shift:] + chunk
+        self.pos = 0
+        return shift
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character.
+        """
+        while True:
+            match = NON_SPACE.search(self.buffer, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            self.read_more()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected `{char}` in JSON document, found `{found}`.")
+        self.pos += 1
+
+    def scan_string(self, i, skip) -> int:
+        """Returns the index just past the string whose opening quote ends
+        at `i`.
+        """
+        while True:
+            match = STRING_TOKEN.search(self.buffer, i)
+            if match is None:
+                # `i` can point past the buffer when it ended on a backslash.
+                i = max(i, len(self.buffer))
+                if skip:
+                    self.pos = min(i, len(self.buffer))
+                i -= self.read_more()
+            elif match.group() == "\\":
+                i = match.end() + 1
+            else:
+                return match.end()
+
+    def scan_value(self, skip) -> int:
+        """Returns the index just past the value starting at `pos`.
+        """
+        char = self.peek()
+        i = self.pos + 1
+        if char == '"':
+            return self.scan_string(i, skip)
+        if char in "[{":
+            return self.scan_container(i, skip)
+        return self.scan_scalar(i)
+
+    def scan_scalar(self, i) -> int:
+        """Returns the index just past the number, literal or constant whose
+        first character is just before `i`.
+        """
+        while True:
+            match = SCALAR_END.search(self.buffer, i)
+            if match is not None:
+                return match.start()
+            i = len(self.buffer)
+            try:
+                i -= self.read_more()
+            except ValueError:
+                # A scalar can be the whole document.
+                return i
+
+    def scan_container(self, i, skip) -> int:
+        """Returns the index just past the array or object whose opening
+        bracket ends at `i`.
+        """
+        depth = 1
+        while True:
+            match = CONTAINER_TOKEN.search(self.buffer, i)
+            if match is None:
+                i = len(self.buffer)
+                if skip:
+                    self.pos = i
+                i -= self.read_more()
+                continue
+            char = match.group()
+            i = match.end()
+            if char == '"':
+                i = self.scan_string(i, skip)
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return i
+
+    def read_value(self):
+        end = self.scan_value(skip=False)
+        value = json.loads(self.buffer[self.pos:end])
+        self.pos = end
+        return value
+
+    def skip_value(self):
+        self.pos = self.scan_value(skip=True)
+
+    def find_key(self, key):
+        """Moves to the value of `key` in the object just entered.
+        """
+        while True:
+            char = self.peek()
+            if char == "}":
+                raise KeyError(key)
+            if char == ",":
+                self.pos += 1
+                continue
+            name = self.read_value()
+            self.expect(":")
+            if name == key:
+                return
+            self.skip_value()
+
+    def skip_items(self, count):
+        """Skips `count` items of the array just entered.
+        """
+        for index in range(count):
+            if self.peek() == ",":
+                self.pos += 1
+            if self.peek() == "]":
+                raise IndexError(index)
+            self.skip_value()
+        if self.peek() == ",":
+            self.pos += 1
+        if self.peek() == "]":
+            raise IndexError(count)
+
+    def iter_items(self):
+        """Decodes and yields the items of the array just entered.
+        """
+        while True:
+            char = self.peek()
+            if char == "]":
+                self.pos += 1
+                return
+            if char == ",":
+                self.pos += 1
+                continue
+            yield self.read_value()
+
+
+def iter_page_frames(chunks, page=0):
+    """Yields the top-level nodes (frames) of page `page` of a files
+    endpoint response, decoding each one only once its text has arrived.
+    """
+    scanner = JSONScanner(chunks)
+    try:
+        scanner.expect("{")
+        scanner.find_key("document")
+        scanner.expect("{")
+        scanner.find_key("children")
+        scanner.expect("[")
+        scanner.skip_items(page)
+        scanner.expect("{")
+        scanner.find_key("children")
+        scanner.expect("[")
+    except (KeyError, IndexError):
+        raise RuntimeError(f"Page {page} not found in figma file.")
+    yield from scanner.iter_items()
@@ -8,31 +8,15 @@ class Vector(Node):
     def color(self) -> str:
         """Returns HEX form of element RGB color (str)
         """
-        try:
-            color = self.node["fills"][0]["color"]
-            r, g, b, *_ = [int(color.get(i, 0) * 255) for i in "rgba"]
-            return f"#{r:02X}{g:02X}{b:02X}"
-        except Exception:
-            return "#FFFFFF"
+        return self.node.fill_color
 
     def size(self):
-        bbox = self.node["absoluteBoundingBox"]
-        width = bbox["width"]
-        height = bbox["height"]
-        return width, height
+        return self.node.width, self.node.height
 
     def position(self, frame):
         # Returns element coordinates as x (int) and y (int)
-        bbox = self.node["absoluteBoundingBox"]
-        x = bbox["x"]
-        y = bbox["y"]
-
-        frame_bbox = frame.node["absoluteBoundingBox"]
-        frame_x = frame_bbox["x"]
-        frame_y = frame_bbox["y"]
-
-        x = abs(x - frame_x)
-        y = abs(y - frame_y)
+        x = abs(self.node.x - frame.node.x)
+        y = abs(self.node.y - frame.node.y)
         return x, y
 
 
@@ -59,7 +43,7 @@ class Rectangle(Vector):
 
     @property
     def corner_radius(self):
-        return self.node.get("cornerRadius")
+        return self.node.corner_radius
 
     @property
     def rectangle_corner_radii(self):
@@ -84,20 +68,15 @@ class Line(Rectangle):
     def color(self) -> str:
         """Returns HEX form of element RGB color (str)
         """
-        try:
-            color = self.node["strokes"][0]["color"]
-            r, g, b, *_ = [int(color.get(i, 0) * 255) for i in "rgba"]
-            return f"#{r:02X}{g:02X}{b:02X}"
-        except Exception:
-            return "#FFFFFF"
+        return self.node.stroke_color
 
     def size(self):
         width, height = super().size()
-        return width + self.node["strokeWeight"], height + self.node["strokeWeight"]
+        return width + self.node.stroke_weight, height + self.node.stroke_weight
 
     def position(self, frame):
         x, y = super().position(frame)
-        return x - self.node["strokeWeight"], y - self.node["strokeWeight"]
+        return x - self.node.stroke_weight, y - self.node.stroke_weight
 
 
 class UnknownElement(Vector):
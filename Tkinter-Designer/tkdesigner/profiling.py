@@ -0,0 +1,95 @@
+"""
+Per-phase timings and element counts for a generation run.
+"""
+import threading
+import time
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+_done = object()
+
+PHASES = (
+    "fetch", "parse", "image_url", "download", "resize", "render", "write")
+
+
+class Profiler:
+    """Collects the time spent in each generation phase.
+
+    Phases nest: time spent in an inner phase is not counted towards the
+    phase it was entered from, so the totals add up to the profiled time.
+    Timings are summed over threads, so with several workers they can
+    exceed the wall-clock time.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        self.timings = defaultdict(float)
+        self.calls = Counter()
+        self.elements = Counter()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        stack = self.local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self.lock:
+                self.timings[name] += elapsed - nested
+                self.calls[name] += 1
+
+    def iterate(self, name, iterable):
+        """Yields from `iterable`, timing only the work done to produce
+        each item under phase `name`.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                item = next(iterator, _done)
+            if item is _done:
+                return
+            yield item
+
+    def count(self, element_type):
+        if self.enabled:
+            with self.lock:
+                self.elements[element_type] += 1
+
+    def report(self) -> str:
+        total = sum(self.timings.values())
+        lines = [f"{'phase':<12}{'calls':>8}{'seconds':>12}{'share':>9}"]
+        names = [name for name in PHASES if name in self.timings]
+        names += sorted(set(self.timings) - set(PHASES))
+        for name in names:
+            seconds = self.timings[name]
+            share = seconds / total if total else 0
+            lines.append(
+                f"{name:<12}{self.calls[name]:>8}{seconds:>12.4f}{share:>9.1%}")
+        lines.append(f"{'total':<12}{'':>8}{total:>12.4f}")
+
+        lines.append("")
+        lines.append(f"{'element':<20}{'count':>8}")
+        for element_type, count in self.elements.most_common():
+            lines.append(f"{element_type:<20}{count:>8}")
+        return "\n".join(lines)
+
+
+# Shared by the whole package. Disabled unless `--profile` is passed, and a
+# disabled profiler records nothing.
+profiler = Profiler()
@@ -22,6 +22,19 @@ window = Tk()
 
 window.geometry("{{ window.width }}x{{ window.height }}")
 window.configure(bg = "{{ window.bg_color }}")
+{%- if window.atlas %}
+
+
+atlas = PhotoImage(file=relative_to_assets("{{ window.atlas }}"))
+
+
+def atlas_image(x, y, width, height) -> PhotoImage:
+    image = PhotoImage(width=width, height=height)
+    image.tk.call(
+        image, "copy", atlas,
+        "-from", x, y, x + width, y + height, "-to", 0, 0)
+    return image
+{%- endif %}
 
 
 canvas = Canvas(
@@ -46,3 +59,81 @@ window.resizable(False, False)
 window.mainloop()
 
 """
+
+APP_TEMPLATE = """
+# This file was generated by the Tkinter Designer by Parth Jadhav
+# https://github.com/ParthJadhav/Tkinter-Designer
+
+
+from pathlib import Path
+
+# from tkinter import *
+# Explicit imports to satisfy Flake8
+from tkinter import Tk, Canvas, Entry, Text, Button, PhotoImage
+
+
+OUTPUT_PATH = Path(__file__).parent
+ASSETS_PATH = OUTPUT_PATH / Path(r"{{ assets_path }}")
+
+
+def relative_to_assets(path: str) -> Path:
+    return ASSETS_PATH / Path(path)
+
+
+window = Tk()
+{% for window in frames %}
+
+def build_frame_{{ loop.index0 }}():
+    canvas = Canvas(
+        window,
+        bg = "{{ window.bg_color }}",
+        height = {{ window.height }},
+        width = {{ window.width }},
+        bd = 0,
+        highlightthickness = 0,
+        relief = "ridge"
+    )
+{%- for element in window.elements -%}
+    {{ element.to_code() | indent(4) }}
+{%- endfor %}
+    # Tk drops images whose PhotoImage is garbage collected.
+    canvas.images = [
+        value for value in locals().values() if isinstance(value, PhotoImage)]
+    return canvas
+
+{% endfor %}
+# Builder, width, height and background color of every frame.
+FRAMES = [
+{%- for window in frames %}
+    (build_frame_{{ loop.index0 }}, {{ window.width }}, {{ window.height }}, "{{ window.bg_color }}"),
+{%- endfor %}
+]
+
+# Frames are only built the first time they are shown.
+built_frames = {}
+current_frame = None
+
+
+def show_frame(index):
+    global current_frame
+
+    if index not in built_frames:
+        built_frames[index] = FRAMES[index][0]()
+    if current_frame is not None:
+        built_frames[current_frame].place_forget()
+
+    _, width, height, bg_color = FRAMES[index]
+    window.geometry(f"{width}x{height}")
+    window.configure(bg = bg_color)
+    built_frames[index].place(x = 0, y = 0)
+    current_frame = index
+
+
+window.bind("<Control-Next>", lambda e: show_frame((current_frame + 1) % len(FRAMES)))
+window.bind("<Control-Prior>", lambda e: show_frame((current_frame - 1) % len(FRAMES)))
+
+show_frame(0)
+window.resizable(False, False)
+window.mainloop()
+
+"""
@@ -4,6 +4,20 @@ Small utility functions.
 import requests
 from PIL import Image
 import io
+import re
+import urllib.request
+
+from .profiling import profiler
+
+
+def file_key_from_url(url) -> str:
+    """Returns the file key of a Figma file or design URL.
+    """
+    match = re.search(
+        r'https://www.figma.com/(file|design)/([0-9A-Za-z]+)', url.strip().split("?")[0])
+    if match is None:
+        raise ValueError("Invalid file URL.")
+    return match.group(2).strip()
 
 
 def find_between(s, first, last):
@@ -16,10 +30,87 @@ def find_between(s, first, last):
         return ""
 
 
-def download_image(url, image_path):
-    response = requests.get(url)
-    content = io.BytesIO(response.content)
-    im = Image.open(content)
-    im = im.resize((im.size[0] // 2, im.size[1] // 2), Image.LANCZOS)
+RESAMPLING_FILTERS = {
+    "nearest": Image.NEAREST,
+    "box": Image.BOX,
+    "bilinear": Image.BILINEAR,
+    "hamming": Image.HAMMING,
+    "bicubic": Image.BICUBIC,
+    "lanczos": Image.LANCZOS,
+}
+
+
+class ImageOptions:
+    """How node images are requested from Figma and written to the assets.
+
+    Images are rendered at `scale` and scaled back down to 1x with the
+    `resample` filter; at scale 1 the render is used as is. `optimize`
+    and `colors` (palette size to quantise to) make the PNGs smaller at
+    the cost of extra encoding time.
+    """
+
+    def __init__(self, scale=2, resample="lanczos", optimize=False,
+                 colors=None):
+        if resample not in RESAMPLING_FILTERS:
+            raise ValueError(f"Unknown resampling filter `{resample}`.")
+        if colors is not None and not 1 <= colors <= 256:
+            raise ValueError(
+                f"`colors` must be between 1 and 256, got {colors}.")
+        self.scale = scale
+        self.resample = resample
+        self.optimize = optimize
+        self.colors = colors
+
+    @property
+    def reencode(self) -> bool:
+        return self.scale != 1 or self.optimize or self.colors is not None
+
+
+def resize_image(content, image_path, options=None):
+    # Runs in worker processes too, so it is timed by the caller.
+    options = options or ImageOptions()
+    if not options.reencode:
+        with open(image_path, "wb") as file:
+            file.write(content)
+        return
+
+    im = Image.open(io.BytesIO(content))
+    if options.scale != 1:
+        im = im.resize(
+            (int(im.size[0] / options.scale), int(im.size[1] / options.scale)),
+            RESAMPLING_FILTERS[options.resample])
+    if options.colors is not None:
+        im = im.quantize(options.colors, method=Image.FASTOCTREE)
     with open(image_path, "wb") as file:
-        im.save(file)
+        im.save(file, "PNG", optimize=options.optimize)
+
+
+def fetch(url, client=None) -> bytes:
+    with profiler.phase("download"):
+        # `file://` URLs come from the offline `LocalFiles` backend.
+        if url.startswith("file:"):
+            with urllib.request.urlopen(url) as response:
+                return response.read()
+        if client is None:
+            return requests.get(url).content
+        response = client.get(url)
+        response.raise_for_status()
+        return response.content
+
+
+def download_image(url, image_path, resize_executor=None, options=None,
+                   client=None, cache=None):
+    content = fetch(url, client)
+    options = options or ImageOptions()
+    with profiler.phase("resize"):
+        if cache is not None and cache.copy_to(content, options, image_path):
+            return
+        if resize_executor is None:
+            resize_image(content, image_path, options)
+        else:
+            # Decoding and resampling are CPU-bound, hand them to a process
+            # pool so that concurrent downloads don't serialise on the GIL.
+            resize_executor.submit(
+                resize_image, content, str(image_path), options).result()
+        if cache is not None:
+            cache.add(content, options, image_path)